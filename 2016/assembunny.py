@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+# Advent of Code 2016 - assembunny
+# Machine for the assembunny code of day 12, 23 and 25.
+#
+# Operands are decoded once, to a register index or an immediate value, and
+# every instruction is compiled to a closure that takes the register list and
+# the program counter, and returns the next program counter. A tgl only
+# recompiles the instruction it toggles.
+#
+# The optimizer replaces the inc/dec/jnz loops that assembunny uses to add,
+# multiply and clear registers by single macro ops. A macro op sits on the
+# first instruction of its loop; it falls back to that plain instruction when
+# the loop would not terminate, and is rebuilt when a tgl changes any
+# instruction of its loop.
+
+REGISTERS = 'abcd'
+
+TOGGLE = {'inc': 'dec',
+          'dec': 'inc',
+          'tgl': 'inc',
+          'out': 'inc',
+          'jnz': 'cpy',
+          'cpy': 'jnz'}
+
+# returned by out instead of a program counter, to pause the machine
+PAUSE = -1 << 64
+
+# longest loop idiom the optimizer recognizes
+MAX_IDIOM = 6
+
+
+def decode(arg):
+    """Decode an operand to a (is_register, register index or value) pair.
+
+    >>> decode('c')
+    (True, 2)
+    >>> decode('-16')
+    (False, -16)
+    """
+    if arg in REGISTERS:
+        return True, REGISTERS.index(arg)
+    return False, int(arg)
+
+
+def parse(lines):
+    """Parse assembunny source to a list of (op, operands) instructions.
+
+    >>> parse(['cpy 41 a', 'jnz a 2'])
+    [('cpy', ((False, 41), (True, 0))), ('jnz', ((True, 0), (False, 2)))]
+    """
+    program = []
+    for line in lines:
+        cmd, *args = line.split() or ['']
+        if cmd:
+            program.append((cmd, tuple(decode(arg) for arg in args)))
+    return program
+
+
+def skip(r, pc):
+    # invalid instructions, like a toggled cpy to an immediate, are skipped
+    return pc + 1
+
+
+def step(op):
+    # change of a register by an inc or dec
+    return 1 if op == 'inc' else -1
+
+
+class Machine():
+    """Assembunny machine.
+
+    >>> m = Machine(parse(['cpy 2 a', 'tgl a', 'tgl a', 'tgl a', 'cpy 1 a',
+    ...                    'dec a', 'dec a']))
+    >>> m.execute()
+    {'a': 3, 'b': 0, 'c': 0, 'd': 0}
+    >>> m = Machine(parse(['cpy 3 b', 'out b', 'dec b', 'jnz b -2']))
+    >>> list(m.run())
+    [3, 2, 1]
+    >>> m = Machine(parse(['cpy 7 b', 'cpy 6 d', 'cpy b c', 'inc a', 'dec c',
+    ...                    'jnz c -2', 'dec d', 'jnz d -5']), a=1)
+    >>> m.code[2].__name__
+    'mul'
+    >>> m.execute()
+    {'a': 43, 'b': 7, 'c': 0, 'd': 0}
+    """
+
+    def __init__(self, program, optimize=True, **registers):
+        self.program = list(program)
+        self.optimize = optimize
+        self.regs = [registers.get(r, 0) for r in REGISTERS]
+        self.pc = 0
+        self.value = None
+        self.code = [self.compile(i) for i in range(len(self.program))]
+
+    @property
+    def registers(self):
+        return dict(zip(REGISTERS, self.regs))
+
+    def state(self):
+        """Return a snapshot of everything that determines what the machine
+        does next: the program counter, the registers and the (toggled)
+        instructions."""
+        return self.pc, tuple(self.regs), tuple(op for op, _ in self.program)
+
+    def compile(self, index):
+        if self.optimize:
+            for idiom in (self._mul, self._add, self._clear):
+                macro = idiom(index)
+                if macro:
+                    return macro
+        return self.instruction(index)
+
+    def instruction(self, index):
+        op, args = self.program[index]
+        return getattr(self, '_' + op)(*args)
+
+    def toggle(self, index):
+        if 0 <= index < len(self.program):
+            op, args = self.program[index]
+            self.program[index] = (TOGGLE[op], args)
+            # every idiom that includes index starts at most MAX_IDIOM - 1
+            # instructions earlier
+            for i in range(max(0, index - MAX_IDIOM + 1), index + 1):
+                self.code[i] = self.compile(i)
+
+    def run(self):
+        """Run the program, yielding every value it sends out. Returns when
+        the program counter leaves the program."""
+        code, r, n = self.code, self.regs, len(self.code)
+        pc = self.pc
+        while True:
+            while 0 <= pc < n:
+                pc = code[pc](r, pc)
+            if pc != PAUSE:
+                self.pc = pc
+                return
+            yield self.value
+            pc = self.pc
+
+    def execute(self):
+        """Run the program until it halts, returns the registers."""
+        for _ in self.run():
+            pass
+        return self.registers
+
+    def _cpy(self, x, y):
+        (xr, xv), (yr, yv) = x, y
+        if not yr:
+            return skip
+        if xr:
+            def cpy(r, pc):
+                r[yv] = r[xv]
+                return pc + 1
+        else:
+            def cpy(r, pc):
+                r[yv] = xv
+                return pc + 1
+        return cpy
+
+    def _inc(self, x):
+        xr, xv = x
+        if not xr:
+            return skip
+
+        def inc(r, pc):
+            r[xv] += 1
+            return pc + 1
+        return inc
+
+    def _dec(self, x):
+        xr, xv = x
+        if not xr:
+            return skip
+
+        def dec(r, pc):
+            r[xv] -= 1
+            return pc + 1
+        return dec
+
+    def _jnz(self, x, y):
+        (xr, xv), (yr, yv) = x, y
+        if not xr and not xv:
+            return skip
+        if xr and yr:
+            def jnz(r, pc):
+                return pc + r[yv] if r[xv] else pc + 1
+        elif xr:
+            def jnz(r, pc):
+                return pc + yv if r[xv] else pc + 1
+        elif yr:
+            def jnz(r, pc):
+                return pc + r[yv]
+        else:
+            def jnz(r, pc):
+                return pc + yv
+        return jnz
+
+    def _tgl(self, x):
+        xr, xv = x
+        toggle = self.toggle
+        if xr:
+            def tgl(r, pc):
+                toggle(pc + r[xv])
+                return pc + 1
+        else:
+            def tgl(r, pc):
+                toggle(pc + xv)
+                return pc + 1
+        return tgl
+
+    def _out(self, x):
+        xr, xv = x
+
+        def out(r, pc):
+            self.value = r[xv] if xr else xv
+            self.pc = pc + 1
+            return PAUSE
+        return out
+
+    def _loop(self, index):
+        # inc/dec x, inc/dec y, jnz y -2 (in any order), returns x, its step,
+        # y and its step
+        body = self.program[index:index + 3]
+        if len(body) < 3 or body[0][0] not in ('inc', 'dec') or \
+                body[1][0] not in ('inc', 'dec') or body[2][0] != 'jnz':
+            return None
+        (r1, x1), = body[0][1]
+        (r2, x2), = body[1][1]
+        (yr, y), offset = body[2][1]
+        if not r1 or not r2 or not yr or x1 == x2 or offset != (False, -2):
+            return None
+        if x2 == y:
+            return x1, step(body[0][0]), y, step(body[1][0])
+        elif x1 == y:
+            return x2, step(body[1][0]), y, step(body[0][0])
+        return None
+
+    def _clear(self, index):
+        # inc/dec y, jnz y -1
+        body = self.program[index:index + 2]
+        if len(body) < 2 or body[0][0] not in ('inc', 'dec') or \
+                body[1][0] != 'jnz':
+            return None
+        (yr, y), = body[0][1]
+        if not yr or body[1][1] != ((True, y), (False, -1)):
+            return None
+        sy = step(body[0][0])
+        plain = self.instruction(index)
+
+        def clear(r, pc):
+            if r[y] * sy < 0:
+                r[y] = 0
+                return pc + 2
+            return plain(r, pc)
+        return clear
+
+    def _add(self, index):
+        # inc/dec x, inc/dec y, jnz y -2
+        loop = self._loop(index)
+        if loop is None:
+            return None
+        x, sx, y, sy = loop
+        plain = self.instruction(index)
+
+        def add(r, pc):
+            n = -sy * r[y]
+            if n > 0:
+                r[x] += sx * n
+                r[y] = 0
+                return pc + 3
+            return plain(r, pc)
+        return add
+
+    def _mul(self, index):
+        # cpy s t, inc/dec x, inc/dec t, jnz t -2, inc/dec o, jnz o -5
+        body = self.program[index:index + MAX_IDIOM]
+        if len(body) < MAX_IDIOM or body[0][0] != 'cpy' or \
+                body[4][0] not in ('inc', 'dec') or body[5][0] != 'jnz':
+            return None
+        (sr, s), (tr, t) = body[0][1]
+        (orr, o), = body[4][1]
+        loop = self._loop(index + 1)
+        if not tr or not orr or loop is None or \
+                body[5][1] != ((True, o), (False, -5)):
+            return None
+        x, sx, y, st = loop
+        if y != t or o in (x, t) or (sr and s in (x, t, o)):
+            return None
+        so = step(body[4][0])
+        plain = self.instruction(index)
+
+        def mul(r, pc):
+            n = -st * (r[s] if sr else s)
+            m = -so * r[o]
+            if n > 0 and m > 0:
+                r[x] += sx * n * m
+                r[t] = 0
+                r[o] = 0
+                return pc + MAX_IDIOM
+            return plain(r, pc)
+        return mul
@@ -17,7 +17,7 @@ def vec2digit(v):
     return v[1] * 3 + v[0] + 1
 
 def main(argv):
-    if len(sys.argv) < 2:
+    if len(argv) < 2:
         print("Usage: {} puzzle.txt".format(argv[0]))
         return(1)
     position = Vec2D(1, 1)
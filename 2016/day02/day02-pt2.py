@@ -23,7 +23,7 @@ def vec2digit(v):
     return keypad[v[0]][v[1]]
 
 def main(argv):
-    if len(sys.argv) < 2:
+    if len(argv) < 2:
         print("Usage: {} puzzle.txt".format(argv[0]))
         return(1)
     position = Vec2D(2, 0)
@@ -3,10 +3,20 @@
 
 import sys
 
-with open(sys.argv[1]) as f:
-    possible = 0
-    for line in f:
-        segments = [int(n) for n in line.split()]
-        if 2*max(segments) < sum(segments):
-            possible += 1
-    print("{} possible triangle{}".format(possible, possible > 1 and 's' or '' ))
\ No newline at end of file
+
+def main(argv):
+    if len(argv) < 2:
+        print("Usage: {} puzzle.txt".format(argv[0]))
+        return 1
+    with open(argv[1]) as f:
+        possible = 0
+        for line in f:
+            segments = [int(n) for n in line.split()]
+            if 2*max(segments) < sum(segments):
+                possible += 1
+        print("{} possible triangle{}".format(possible, possible > 1 and 's' or '' ))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
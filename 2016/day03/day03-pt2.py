@@ -3,10 +3,20 @@
 
 import sys
 
-with open(sys.argv[1]) as f:
-    possible = 0
-    triangles = [map(int, line.split()) for line in f]
-    for i in range(0, len(triangles), 3):
-        triangles[i:i+3] = zip(*triangles[i:i+3])
-    possible = sum(2*max(triangle) < sum(triangle) for triangle in triangles)
-    print("{} possible triangle{}".format(possible, possible > 1 and 's' or '' ))
\ No newline at end of file
+
+def main(argv):
+    if len(argv) < 2:
+        print("Usage: {} puzzle.txt".format(argv[0]))
+        return 1
+    with open(argv[1]) as f:
+        possible = 0
+        triangles = [map(int, line.split()) for line in f]
+        for i in range(0, len(triangles), 3):
+            triangles[i:i+3] = zip(*triangles[i:i+3])
+        possible = sum(2*max(triangle) < sum(triangle) for triangle in triangles)
+        print("{} possible triangle{}".format(possible, possible > 1 and 's' or '' ))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
@@ -22,11 +22,20 @@ def parse(line):
     checksum = tail[tail.index('['):].strip('[]')
     return name, int(sector), checksum
 
-with open(sys.argv[1]) as f:
-    sector_sum = 0
-    for line in f:
-        name, sector, checksum = parse(line)
-        if valid(name, checksum):
-            sector_sum += int(sector)    
-    print(sector_sum)
-        
\ No newline at end of file
+
+def main(argv):
+    if len(argv) < 2:
+        print("Usage: {} puzzle.txt".format(argv[0]))
+        return 1
+    with open(argv[1]) as f:
+        sector_sum = 0
+        for line in f:
+            name, sector, checksum = parse(line)
+            if valid(name, checksum):
+                sector_sum += int(sector)    
+        print(sector_sum)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
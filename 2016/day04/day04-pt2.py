@@ -30,8 +30,18 @@ def parse(line):
     checksum = tail[tail.index('['):].strip('[]')
     return name, int(sector), checksum
 
-with open(sys.argv[1]) as f:
-    for line in f:
-        name, sector, checksum = parse(line)
-        if valid(name, checksum):
-            print(decode(name, sector), sector)
+
+def main(argv):
+    if len(argv) < 2:
+        print("Usage: {} puzzle.txt".format(argv[0]))
+        return 1
+    with open(argv[1]) as f:
+        for line in f:
+            name, sector, checksum = parse(line)
+            if valid(name, checksum):
+                print(decode(name, sector), sector)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
@@ -3,26 +3,25 @@
 
 import sys
 import itertools
-from hashlib import md5
-
-def gen_password(door_id):
-    index = 0
-    while True:
-        string = door_id + str(index)
-        digest = md5(string.encode('utf-8')).hexdigest()
-        if digest.startswith('00000'):
-            yield digest[5]
-        index += 1
-    
+
+from door import search
+
+
+def gen_password(door_id, jobs=None):
+    for index, digest in search(door_id, jobs):
+        yield '{:x}'.format(digest[2])
+
+
 def main(argv):
     if len(argv) < 2:
-        print("Usage: day05-pt1.py door_id")
+        print("Usage: day05-pt1.py door_id [jobs]")
         return 1
     door_id = argv[1]
-    password = itertools.islice(gen_password(door_id), 8)
+    jobs = int(argv[2]) if len(argv) > 2 else None
+    password = itertools.islice(gen_password(door_id, jobs), 8)
     print("".join(password))
     return 0
-    
+
+
 if __name__ == '__main__':
     sys.exit(main(sys.argv))
-        
\ No newline at end of file
@@ -2,32 +2,31 @@
 # Advent of Code 2016 - Day 5, Part Two
 
 import sys
-import itertools
-from hashlib import md5
-
-def gen_password(door_id):
-    index = 0
-    while True:
-        string = door_id + str(index)
-        digest = md5(string.encode('utf-8')).hexdigest()
-        pos = int(digest[5], 16)
-        if digest.startswith('00000') and pos < 8:
-            yield pos, digest[6]
-        index += 1
-    
+
+from door import search
+
+
+def gen_password(door_id, jobs=None):
+    for index, digest in search(door_id, jobs):
+        pos = digest[2]
+        if pos < 8:
+            yield pos, '{:x}'.format(digest[3] >> 4)
+
+
 def main(argv):
     if len(argv) < 2:
-        print("Usage: day05-pt2.py door_id")
+        print("Usage: day05-pt2.py door_id [jobs]")
         return 1
     door_id = argv[1]
+    jobs = int(argv[2]) if len(argv) > 2 else None
     password = ['_']*8
-    for pos, char in gen_password(door_id):
-        if password[pos] is '_':
+    for pos, char in gen_password(door_id, jobs):
+        if password[pos] == '_':
             password[pos] = char
             print("".join(password))
             if '_' not in password:
                 return 0
-    
+
+
 if __name__ == '__main__':
     sys.exit(main(sys.argv))
-        
\ No newline at end of file
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# Advent of Code 2016 - Day 5
+# Sharded search for the hashes of the door password.
+#
+# The index space is cut in chunks that worker processes search
+# independently. Every hash starts from a copy of the MD5 state after the
+# door id, and the five leading zero nibbles are tested on the raw digest
+# bytes. Chunks are collected in order, so the hits come out in order of their
+# index while later chunks are still being searched.
+
+import os
+from collections import deque
+from functools import partial
+from hashlib import md5
+from itertools import count
+from multiprocessing import Pool
+
+CHUNK = 100000
+
+
+def scan(door_id, start, stop):
+    """Return the (index, digest) pairs with a hex digest starting with five
+    zeros, for the indices in [start, stop).
+
+    >>> [(index, digest.hex()[:6]) for index, digest in
+    ...  scan('abc', 3231920, 3231940)]
+    [(3231929, '000001')]
+    """
+    prefix = md5(door_id.encode('utf-8'))
+    hits = []
+    for index in range(start, stop):
+        h = prefix.copy()
+        h.update(str(index).encode('ascii'))
+        digest = h.digest()
+        if not digest[0] and not digest[1] and digest[2] < 16:
+            hits.append((index, digest))
+    return hits
+
+
+def search(door_id, jobs=None, chunk=CHUNK):
+    """Yield the (index, digest) pairs with a hex digest starting with five
+    zeros, in order of index. Searches with jobs processes, or in this one
+    if jobs is 1.
+
+    >>> next(search('abc', 1))[0]
+    3231929
+    """
+    jobs = jobs or os.cpu_count()
+    starts = count(0, chunk)
+    if jobs == 1:
+        for start in starts:
+            yield from scan(door_id, start, start + chunk)
+        return
+    task = partial(scan, door_id)
+    with Pool(jobs) as pool:
+        # keep every worker busy with a few chunks ahead
+        pending = deque()
+        for start in starts:
+            pending.append(pool.apply_async(task, (start, start + chunk)))
+            if len(pending) >= 2 * jobs:
+                yield from pending.popleft().get()
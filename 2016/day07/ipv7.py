@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# Advent of Code 2016 - Day 7
+# TLS and SSL support of IPv7 addresses.
+#
+# An address is classified in a single pass over its characters, keeping the
+# last three characters of the current sequence and whether it is a hypernet
+# sequence. Every ABBA and ABA is recorded as soon as its last character is
+# read. Large files are split in byte ranges at line boundaries, which are
+# classified in parallel.
+#
+# Run it to get both counts at once:
+#
+#   ipv7.py puzzle.txt [--jobs n]
+
+import os
+import sys
+from multiprocessing import Pool
+
+
+def classify(address):
+    """Return whether address supports TLS and whether it supports SSL.
+
+    >>> classify('abba[mnop]qrst')
+    (True, False)
+    >>> classify('ioxxoj[asdfgh]zxcvbn')
+    (True, False)
+    >>> classify('abcd[bddb]xyyx')
+    (False, False)
+    >>> classify('aba[bab]xyz')
+    (False, True)
+    >>> classify('zazbz[bzb]cdb')
+    (False, True)
+    """
+    hypernet = False
+    abba = [False, False]
+    # (a, b) of every ABA in the supernet and every BAB in the hypernet
+    abas = (set(), set())
+    ssl = False
+    p3 = p2 = p1 = None
+    for c in address:
+        if c == '[' or c == ']':
+            hypernet = c == '['
+            p3 = p2 = p1 = None
+            continue
+        if c == p2 and c != p1:
+            aba = (p1, c) if hypernet else (c, p1)
+            abas[hypernet].add(aba)
+            ssl = ssl or aba in abas[not hypernet]
+        if c == p3 and p1 == p2 and c != p1:
+            abba[hypernet] = True
+        p3, p2, p1 = p2, p1, c
+    return abba[False] and not abba[True], ssl
+
+
+def count(lines):
+    """Return the number of addresses that support TLS and SSL.
+
+    >>> count(['abba[mnop]qrst', 'aba[bab]xyz', 'xyx[xyx]xyx'])
+    (1, 1)
+    """
+    tls = ssl = 0
+    for line in lines:
+        address = line.strip()
+        if address:
+            t, s = classify(address)
+            tls += t
+            ssl += s
+    return tls, ssl
+
+
+def count_range(path, start, stop):
+    # count the lines that start in the byte range [start, stop) of the file
+    with open(path, 'rb') as f:
+        if start:
+            # skip to the first line that starts at or after start
+            f.seek(start - 1)
+            f.readline()
+        pos = f.tell()
+
+        def lines():
+            nonlocal pos
+            while pos < stop:
+                line = f.readline()
+                if not line:
+                    return
+                pos += len(line)
+                yield line.decode('ascii')
+        return count(lines())
+
+
+def count_file(path, jobs=1):
+    """Return the number of addresses in the file at path that support TLS
+    and SSL, splitting the file over jobs processes."""
+    if jobs == 1:
+        with open(path) as f:
+            return count(f)
+    size = os.path.getsize(path)
+    # a few shards per job, so that they finish around the same time
+    shards = 4 * jobs
+    bounds = [size * i // shards for i in range(shards + 1)]
+    with Pool(jobs) as pool:
+        counts = pool.starmap(count_range,
+                              [(path, start, stop)
+                               for start, stop in zip(bounds, bounds[1:])])
+    return tuple(map(sum, zip(*counts)))
+
+
+def options(argv):
+    # returns the arguments without --jobs n, and the number of jobs
+    argv = list(argv)
+    jobs = 1
+    if '--jobs' in argv:
+        i = argv.index('--jobs')
+        jobs = int(argv[i + 1]) if i + 1 < len(argv) else os.cpu_count()
+        del argv[i:i + 2]
+    return argv, jobs
+
+
+def main(argv):
+    argv, jobs = options(argv)
+    if len(argv) < 2:
+        print("Usage: {} puzzle.txt [--jobs n]".format(argv[0]))
+        return 1
+    tls, ssl = count_file(argv[1], jobs)
+    print(tls)
+    print(ssl)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
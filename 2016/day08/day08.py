@@ -1,57 +1,93 @@
 #!/usr/bin/env python3
 # Advent of Code 2016 - Day 8, Part One and Two
+#
+# The display is a bytearray with a byte per pixel, row after row. A rect
+# assigns a slice per row, and a row or column rotation is a slice of the row
+# or an extended slice of the column put back in a different order, so every
+# operation is done by bytearray methods instead of a Python loop per pixel.
+# The display is only rendered at the end, when asked for.
 
 import sys
-from itertools import chain
 
 COLS = 50
 ROWS = 6
 
 
-def rect(display, x, y):
-    for r in range(y):
-        for c in range(x):
-            display[r][c] = '#'
+class Display():
+    """
+    >>> display = Display(7, 3)
+    >>> display.rect(3, 2)
+    >>> display.rotate_col(1, 1)
+    >>> display.rotate_row(0, 4)
+    >>> display.rotate_col(1, 1)
+    >>> display.render().splitlines()
+    [' #  # #', '# #    ', ' #     ']
+    >>> display.lit()
+    6
+    """
 
+    def __init__(self, cols=COLS, rows=ROWS):
+        self.cols = cols
+        self.nrows = rows
+        self.pixels = bytearray(cols * rows)
 
-def rotate_col(display, x, s):
-    d = list(zip(*display))
-    rotate_row(d, x, s)
-    display[:] = list(map(list, zip(*d)))
+    def rect(self, x, y):
+        x = min(x, self.cols)
+        on = b'\x01' * x
+        for r in range(min(y, self.nrows)):
+            start = r * self.cols
+            self.pixels[start:start + x] = on
 
+    def rotate_row(self, y, s):
+        start = y * self.cols
+        row = self.pixels[start:start + self.cols]
+        s %= self.cols
+        self.pixels[start:start + self.cols] = row[-s:] + row[:-s]
 
-def rotate_row(display, y, s):
-    display[y] = display[y][-s:] + display[y][:-s]
+    def rotate_col(self, x, s):
+        column = self.pixels[x::self.cols]
+        s %= self.nrows
+        self.pixels[x::self.cols] = column[-s:] + column[:-s]
+
+    def lit(self):
+        return self.pixels.count(1)
+
+    def render(self):
+        pixels = bytes(self.pixels).translate(bytes.maketrans(b'\x00\x01', b' #'))
+        return '\n'.join(pixels[start:start + self.cols].decode('ascii')
+                         for start in range(0, len(pixels), self.cols))
 
 
 def main(argv):
+    show = '--show' in argv
+    argv = [arg for arg in argv if arg != '--show']
     if len(argv) < 2:
-        print("Usage: {} puzzle.txt".format(argv[0]))
+        print("Usage: {} puzzle.txt [cols rows] [--show]".format(argv[0]))
         return 1
-    display = [[' ' for _ in range(COLS)] for _ in range(ROWS)]
+    cols, rows = map(int, argv[2:4]) if len(argv) > 3 else (COLS, ROWS)
+    display = Display(cols, rows)
     with open(argv[1]) as f:
         for line in f:
             cmd, *args = line.strip().split()
-            print(line.strip())
             if cmd == 'rect':
                 x, y = map(int, args[0].split('x'))
-                rect(display, x, y)
+                display.rect(x, y)
             elif cmd == 'rotate':
                 d = int(args[1].split('=')[1])
                 s = int(args[3])
                 if args[0] == 'column':
-                    rotate_col(display, d, s)
+                    display.rotate_col(d, s)
                 elif args[0] == 'row':
-                    rotate_row(display, d, s)
+                    display.rotate_row(d, s)
                 else:
                     print('err?', cmd, args)
                     return 1
             else:
                 print('err?', cmd, args)
                 return 1
-            for row in display:
-                print("".join(row))
-    print("".join(chain.from_iterable(display)).count('#'))
+    if show:
+        print(display.render())
+    print(display.lit())
     return 0
 
 
@@ -3,27 +3,15 @@
 
 import sys
 
+from decompress import file_lengths
+
 def main(argv):
     if len(argv) < 2:
         print("Usage: {} puzzle.txt".format(argv[0]))
         return 1
-    with open(argv[1]) as f:
-        for line in f:
-            output = []
-            line = line.strip()
-            while True:
-                head, sep, tail = line.partition('(')
-                output.append(head)
-                if sep:
-                    head, sep, tail = tail.partition(')') 
-                    count, repetitions = map(int, head.split('x'))
-                    output.append(tail[:count] * repetitions)
-                    line = tail[count:]
-                else:
-                    # we're done
-                    break
-            print(len("".join(output)))
+    for v1, v2 in file_lengths(argv[1]):
+        print(v1)
+    return 0
 
-        
 if __name__ == '__main__':
-    sys.exit(main(sys.argv))
\ No newline at end of file
+    sys.exit(main(sys.argv))
@@ -3,23 +3,18 @@
 
 import sys
 
-def decompress(string):
-    size = 0
-    head, sep, tail = string.partition('(')
-    size += len(head)
-    if sep:
-        head, sep, tail = tail.partition(')') 
-        count, repetitions = map(int, head.split('x'))        
-        size += repetitions * decompress(tail[:count]) + decompress(tail[count:])
-    return size
+from decompress import file_lengths
 
 def main(argv):
     if len(argv) < 2:
         print("Usage: {} puzzle.txt".format(argv[0]))
         return 1
-    with open(argv[1]) as f:
-        for line in f:
-            print(decompress(line.strip()))
-        
+    for v1, v2 in file_lengths(argv[1]):
+        if v2 is None:
+            print('err? marker cut off by the data of another marker')
+            return 1
+        print(v2)
+    return 0
+
 if __name__ == '__main__':
-    sys.exit(main(sys.argv))
\ No newline at end of file
+    sys.exit(main(sys.argv))
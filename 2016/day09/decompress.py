@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# Advent of Code 2016 - Day 9
+# Decompressed lengths, without decompressing.
+#
+# The input is walked by index, jumping from marker to marker with find, so
+# a run of plain characters is counted at once. Version 2 keeps a stack of
+# the end of every marker's data with the multiplier that was in effect
+# before it. Version 1 reads as plain data what version 2 may read as a
+# marker, so it keeps its own position, which catches up with version 2
+# after every step. Both lengths come out of the same pass, and nothing but
+# the marker text itself is ever copied, so the input can be an mmap'd file.
+
+import mmap
+import re
+
+
+def _marker(data, i, end):
+    # returns the end, count and repetitions of the marker at data[i] that
+    # closes before end
+    close = data.find(b')', i, end)
+    if close < 0:
+        raise ValueError('unclosed marker at {}'.format(i))
+    count, repetitions = map(int, data[i + 1:close].split(b'x'))
+    return close + 1, count, repetitions
+
+
+def lengths(data, start=0, end=None):
+    """Return the (version 1, version 2) decompressed length of the bytes
+    data[start:end]. The version 2 length is None if the data has a marker
+    that version 2 cannot read, while version 1 can.
+
+    >>> lengths(b'X(8x2)(3x3)ABCY')
+    (18, 20)
+    >>> lengths(b'(27x12)(20x12)(13x14)(7x10)(1x12)A')
+    (324, 241920)
+    >>> lengths(b'..A(1x5)BC..', 2, 10)
+    (7, 7)
+    >>> lengths(b'(1x2)(3x3)ABC')
+    (9, None)
+    >>> lengths(b'A(2x2)(1x3)B')
+    (9, None)
+    >>> lengths(b'(3x2)(ab')
+    (6, None)
+    """
+    if end is None:
+        end = len(data)
+    # version 1 has counted everything before v1_at, and parses its own
+    # markers, as it may read as data what version 2 reads as a marker
+    v1 = 0
+    v1_at = start
+    v2 = 0
+    stack = []
+    multiplier = 1
+    i = start
+    while True:
+        # version 1 catches up with version 2
+        while v1_at < i:
+            marker = data.find(b'(', v1_at, i)
+            if marker < 0:
+                v1 += i - v1_at
+                v1_at = i
+                break
+            v1 += marker - v1_at
+            v1_at, count, repetitions = _marker(data, marker, end)
+            count = min(count, end - v1_at)
+            v1 += count * repetitions
+            v1_at += count
+        if i >= end:
+            break
+        while stack and stack[-1][0] <= i:
+            multiplier = stack.pop()[1]
+        # the data of the innermost marker, or the end
+        limit = stack[-1][0] if stack else end
+        marker = data.find(b'(', i, limit)
+        if marker == i:
+            try:
+                i, count, repetitions = _marker(data, i, limit)
+            except ValueError:
+                v2 = None
+                i = end
+                continue
+            stack.append((min(i + count, limit), multiplier))
+            multiplier *= repetitions
+            continue
+        if marker < 0:
+            marker = limit
+        # plain characters up to the next marker or the end of the data of
+        # the innermost marker, whichever comes first
+        v2 += multiplier * (marker - i)
+        i = marker
+    return v1, v2
+
+
+def file_lengths(path):
+    """Yield the lengths of every line of the file at path, which is mapped
+    in memory instead of read."""
+    with open(path, 'rb') as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty file
+            return
+        with data:
+            # from the first to the last non-space character of a line
+            for line in re.finditer(rb'\S(?:[^\r\n]*\S)?', data):
+                yield lengths(data, line.start(), line.end())
@@ -1,9 +1,12 @@
 #!/usr/bin/env python3
 # Advent of Code 2016 - Day 10, Part One & Two
+#
+# A bot is put in a work queue when it gets its second chip, so every bot
+# only acts once it can, instead of all bots being asked every round.
 
 import sys
 import re
-from collections import defaultdict
+from collections import defaultdict, deque
 
 class keydefaultdict(defaultdict):
     def __missing__(self, key):
@@ -14,65 +17,84 @@ class keydefaultdict(defaultdict):
             return ret
 
 class Output():
+    __slots__ = ('nr', 'chip')
+
     def __init__(self, nr):
         self.nr = nr
         self.chip = None
-        
+
     def give(self, chip):
+        # returns whether the receiver is ready to act
         self.chip = chip
+        return False
+
+class Bot():
+    __slots__ = ('nr', 'low', 'high', 'chips')
 
-class Bot():    
     def __init__(self, nr):
         self.nr = nr
         self.low = None
         self.high = None
         self.chips = []
-    
+
     def give(self, chip):
         self.chips.append(chip)
-    
-    def step(self):
-        if len(self.chips) == 2:
-            if 61 in self.chips and 17 in self.chips:
-                print('bot {} compares 61 and 17'.format(self.nr))
-            self.low.give(min(self.chips))
-            self.high.give(max(self.chips))
-            self.chips = []
-        return len(self.chips) != 0
-        
+        return len(self.chips) == 2
+
+
+def parse(lines):
+    bots = keydefaultdict(Bot)
+    outputs = keydefaultdict(Output)
+    targets = {'bot': bots, 'output': outputs}
+    for line in lines:
+        head, tail = line.split(maxsplit=1)
+        if head == 'value':
+            chip, bot = map(int, re.findall(r'(\d+)', tail))
+            bots[bot].give(chip)
+        elif head == 'bot':
+            parts = tail.split()
+            bot, low_id, high_id = map(int, re.findall(r'(\d+)', tail))
+            bots[bot].low = targets[parts[4]][low_id]
+            bots[bot].high = targets[parts[9]][high_id]
+        else:
+            print('err?', line)
+    return bots, outputs
+
+
+def run(bots, compare=None):
+    """Let the bots hand out their chips until none of them can act.
+
+    :compare: function called with the number of a bot and the low and high
+              chip, for every comparison a bot makes
+    """
+    queue = deque(bot for bot in bots.values() if len(bot.chips) == 2)
+    while queue:
+        bot = queue.popleft()
+        a, b = bot.chips
+        low, high = (a, b) if a < b else (b, a)
+        bot.chips = []
+        if compare is not None:
+            compare(bot.nr, low, high)
+        if bot.low.give(low):
+            queue.append(bot.low)
+        if bot.high.give(high):
+            queue.append(bot.high)
+
 
 def main(argv):
     if len(argv) < 2:
-        print("Usage: {} puzzle.txt".format(argv[0]))
+        print("Usage: {} puzzle.txt [low high]".format(argv[0]))
         return 1
-    bots = keydefaultdict(Bot)
-    outputs = keydefaultdict(Output)
+    low, high = map(int, argv[2:4]) if len(argv) > 3 else (17, 61)
     with open(argv[1]) as f:
-        for line in f:
-            head, tail = line.split(maxsplit=1)
-            if head == 'value':
-                chip, bot = map(int, re.findall(r'(\d+)', tail))
-                bots[bot].give(chip)
-            elif head == 'bot':
-                parts = tail.split()
-                bot, low_id, high_id = map(int, re.findall(r'(\d+)', tail))
-                low_type = parts[4]
-                high_type = parts[9]
-                if low_type == 'output':
-                    bots[bot].low = outputs[low_id]
-                else:
-                    bots[bot].low = bots[low_id]
-                if high_type == 'output':
-                    bots[bot].high = outputs[high_id]
-                else:
-                    bots[bot].high = bots[high_id]
-            else:
-                print('err?', line)
-        while True:
-            result = [bot.step() for bot in bots.values()]
-            if not any(result):
-                break
-        print(outputs[0].chip * outputs[1].chip * outputs[2].chip)
-        
+        bots, outputs = parse(f)
+
+    def report(nr, a, b):
+        if (a, b) == (low, high):
+            print('bot {} compares {} and {}'.format(nr, high, low))
+    run(bots, report)
+    print(outputs[0].chip * outputs[1].chip * outputs[2].chip)
+    return 0
+
 if __name__ == '__main__':
-    sys.exit(main(sys.argv))
\ No newline at end of file
+    sys.exit(main(sys.argv))
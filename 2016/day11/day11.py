@@ -1,91 +1,134 @@
 #!/usr/bin/env python3
 # Advent of Code 2016 - Day 11, Part One & Two
+#
+# A state is packed in a single integer: the elevator floor in the lowest two
+# bits, followed by two bits per item with the floor it is on (0-3). The
+# generator and microchip of a pair are next to each other, so every pair is
+# a nibble:
+#
+#   ... | chip 1 | gen 1 | chip 0 | gen 0 | elevator
+#
+# Pairs are interchangeable, so states are canonicalized by sorting their
+# nibbles before they go in the visited set.
 
+import re
 import sys
-from itertools import chain, combinations
-
-# test set
-# start = (1, ((2,1), (3,1)))
-# goal  = (4, tuple((4,4) for _ in range(len(start[1]))))
-
-# part one
-# start = (1, ((1,1), (1,1), (2,3), (2,2), (2,2)))
-# goal  = (4, tuple((4,4) for _ in range(len(start[1]))))
-
-# part two
-start = (1, ((1,1), (1,1), (2,3), (2,2), (2,2), (1,1), (1, 1)))
-goal  = (4, tuple((4,4) for _ in range(len(start[1]))))
-
-def tuple2list(state):
-    return [state[0], [list(i) for i in state[1]]]
-    
-def list2tuple(state):
-    return (state[0], tuple(tuple(i) for i in state[1]))
-
-def skey(state):
-    return (state[0], tuple(sorted(state[1])))
-    
-def flatten(state):
-    return [state[0]] + list(chain.from_iterable(state[1]))
-
-def is_valid(state):
-    if any(filter(lambda x: x < 1 or x > 4, flatten(state))):
-        return False
-    generators, microchips = zip(*state[1])
-    for i, microchip in enumerate(microchips):
-        if generators[i] != microchip and microchip in generators:
+from itertools import combinations
+
+import graph
+
+FLOORS = 4
+TOP = FLOORS - 1
+
+
+def parse(lines):
+    # returns a list of (generator floor, microchip floor) pairs
+    generators = {}
+    microchips = {}
+    for floor, line in enumerate(lines):
+        for element in re.findall(r'(\w+) generator', line):
+            generators[element] = floor
+        for element in re.findall(r'(\w+)-compatible microchip', line):
+            microchips[element] = floor
+    return [(generators[e], microchips[e]) for e in sorted(generators)]
+
+
+def pack(pairs, elevator=0):
+    state = elevator
+    for i, (generator, microchip) in enumerate(pairs):
+        state |= (generator | microchip << 2) << (2 + 4 * i)
+    return state
+
+
+def canonical(state, npairs):
+    nibbles = sorted((state >> (2 + 4 * i)) & 15 for i in range(npairs))
+    key = state & 3
+    for i, nibble in enumerate(nibbles):
+        key |= nibble << (2 + 4 * i)
+    return key
+
+
+def is_valid(state, npairs):
+    # a microchip without its generator is fried by any other generator
+    floors = 0
+    for i in range(npairs):
+        floors |= 1 << ((state >> (2 + 4 * i)) & 3)
+    for i in range(npairs):
+        nibble = (state >> (2 + 4 * i)) & 15
+        generator, microchip = nibble & 3, nibble >> 2
+        if generator != microchip and floors >> microchip & 1:
             return False
     return True
 
-def gen_states(state):
-    current_floor = state[0]
-
-    # candidates will be 2-tuple values, with (pair, kind), 
-    # whereby kind is 0 for the generator and 1 for the microchip
-    candidates = []
-    for kind, items in enumerate(zip(*state[1])):
-        candidates += [(pair, kind) for pair, floor in enumerate(items) if floor == current_floor]
-    combo = list(chain.from_iterable(combinations(candidates, r) for r in range(1, 3)))
-    for delta in [-1, 1]:
-        new_floor = current_floor + delta
-        if new_floor < 1 or new_floor > 4:
+
+def distance(state, nitems):
+    # Lower bound on the number of steps. Taking c items up across the
+    # boundary above floor f takes at least 2c - 3 crossings (carry two up,
+    # bring one back down) with the elevator below it, or 2c with the
+    # elevator above it, having to come down first. Every step crosses one
+    # boundary, so the lower bounds of the boundaries add up.
+    elevator = state & 3
+    counts = [0] * FLOORS
+    for j in range(nitems):
+        counts[(state >> (2 + 2 * j)) & 3] += 1
+    total = below = 0
+    for floor in range(TOP):
+        below += counts[floor]
+        if not below:
             continue
-        for c in combo:
-            items = tuple2list(state)[1]
-            for move in c:
-                items[move[0]][move[1]] += delta
-            if is_valid([new_floor, items]):
-                yield list2tuple([new_floor, items])
-        
-
-def bfs_paths(start, goal):
-    iterations = 0
-    queue = [(start, [start])]
-    visited = set(skey(start))
-    while queue:
-        (vertex, path) = queue.pop(0)
-        for current in set(gen_states(vertex)) - set(path):
-            iterations += 1
-            sys.stderr.write('{} {}\r'.format(iterations, len(path)))
-            if current == goal:
-                sys.stderr.write('\n')
-                yield path + [current]
-            elif skey(current) in visited:
-                continue
-            else:
-                visited.add(skey(current))
-                queue.append((current, path + [current]))
-                
-def shortest_path(start, goal):
-    try:
-        return next(bfs_paths(start, goal))
-    except StopIteration:
-        return None 
+        if elevator > floor:
+            total += 2 * below
+        else:
+            total += max(1, 2 * below - 3)
+    return total
+
+
+def gen_states(state, npairs):
+    elevator = state & 3
+    items = [j for j in range(2 * npairs)
+             if (state >> (2 + 2 * j)) & 3 == elevator]
+    moves = [1 << (2 + 2 * j) for j in items]
+    moves += [a + b for a, b in combinations(moves, 2)]
+    for delta in (-1, 1):
+        if not 0 <= elevator + delta <= TOP:
+            continue
+        if delta < 0 and not any((state >> (2 + 2 * j)) & 3 < elevator
+                                 for j in range(2 * npairs)):
+            # never bring items down to empty floors
+            continue
+        for move in moves:
+            new_state = state + delta * (1 + move)
+            if is_valid(new_state, npairs):
+                yield new_state
+
+
+def shortest_path(pairs):
+    npairs = len(pairs)
+    goal = pack([(TOP, TOP)] * npairs, TOP)
+    node = graph.astar(pack(pairs),
+                       lambda state: gen_states(state, npairs),
+                       lambda state: state == goal,
+                       lambda state: distance(state, 2 * npairs),
+                       lambda state: canonical(state, npairs))
+    return node and graph.path(node)
+
+
+def steps(pairs):
+    path = shortest_path(pairs)
+    return path and len(path) - 1
+
 
 def main(argv):
-    path = shortest_path(start, goal)
-    print(len(path) - 1)
+    if len(argv) < 2:
+        print("Usage: {} puzzle.txt".format(argv[0]))
+        return 1
+    with open(argv[1]) as f:
+        pairs = parse(f)
+    print(steps(pairs))
+    # part two: an elerium and a dilithium pair on the first floor
+    print(steps(pairs + [(0, 0), (0, 0)]))
     return 0
 
+
 if __name__ == '__main__':
     sys.exit(main(sys.argv))
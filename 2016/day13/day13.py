@@ -1,64 +1,115 @@
 #!/usr/bin/env python3
 # Advent of Code 2016 - Day 13, Part One & Two
+#
+# A single BFS fills a distance field over a wall bitmap of the region that
+# can be reached in a given number of steps; both parts (and any other
+# distance query) read from that field. The bitmap has a border of walls, so
+# the BFS needs no bounds checks: every row is followed by a wall, which is
+# also left of the next row, and there is a row of walls above and below.
 
 import sys
-from itertools import chain, combinations, product
-
-# test set
-# start = (1, 1)
-# goal  = (7, 4)
-# magic = 10
-
-# part one & two
-start = (1, 1)
-goal  = (31, 39)
-magic = 1352
-
-def is_valid(coord):
-    x, y = coord
-    if x < 0 or y < 0:
-        return False
-    s = x*x + 3*x + 2*x*y + y + y*y + magic
-    popcount = bin(s).count('1')
-    return popcount % 2 == 0
-
-def gen_moves(coord):
-    x, y = coord
-    moves = [(x+dx, y+dy) for dx, dy in [(0,-1), (1,0), (0,1), (-1, 0)]]
-    return filter(is_valid, moves)     
-        
-
-def bfs_paths(start, goal, limit=None):
-    iterations = 0
-    queue = [(start, [start])]
-    visited = set(start)
-    while queue:
-        (vertex, path) = queue.pop(0)
-        for current in set(gen_moves(vertex)) - set(path):
-            if limit and len(path) > limit:
-                yield visited
-                return
-            iterations += 1
-            if current == goal:
-                yield path
-            elif current in visited:
-                continue
-            else:
-                visited.add(current)
-                queue.append((current, path + [current]))
-                
-def shortest_path(start, goal, limit=None):
-    try:
-        return next(bfs_paths(start, goal, limit))
-    except StopIteration:
-        return None 
+from array import array
+
+LIMIT = 50
+
+
+def walls(magic, width, height):
+    # bitmap of (width + 1) x (height + 2), see above
+    stride = width + 1
+    grid = bytearray(b'\x01') * (stride * (height + 2))
+    for y in range(height):
+        row = (y + 1) * stride
+        for x in range(width):
+            s = x*x + 3*x + 2*x*y + y + y*y + magic
+            grid[row + x] = s.bit_count() & 1
+    return grid
+
+
+class DistanceField():
+    """Distances from start to every location within reach steps of it.
+
+    >>> field = DistanceField(10, (1, 1), 20)
+    >>> field.distance((7, 4))
+    11
+    >>> field.within(2)
+    5
+    >>> field.distances([(1, 1), (0, 0), (1, 0)])
+    [0, 2, None]
+    """
+
+    def __init__(self, magic, start, reach):
+        sx, sy = start
+        self.reach = reach
+        self.width = sx + reach + 1
+        self.height = sy + reach + 1
+        self.stride = self.width + 1
+        wall = walls(magic, self.width, self.height)
+        dist = array('l', [-1]) * len(wall)
+        stride = self.stride
+
+        origin = self.index(start)
+        dist[origin] = 0
+        frontier = [origin]
+        depth = 0
+        while frontier and depth < reach:
+            depth += 1
+            next_frontier = []
+            for i in frontier:
+                for n in (i - 1, i + 1, i - stride, i + stride):
+                    if not wall[n] and dist[n] < 0:
+                        dist[n] = depth
+                        next_frontier.append(n)
+            frontier = next_frontier
+        # when the frontier dies out, everything reachable is in the field
+        self.complete = not frontier
+        self.dist = dist
+
+    def index(self, coord):
+        x, y = coord
+        return (y + 1) * self.stride + x
+
+    def distance(self, coord):
+        x, y = coord
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        d = self.dist[self.index(coord)]
+        return d if d >= 0 else None
+
+    def distances(self, coords):
+        return [self.distance(coord) for coord in coords]
+
+    def within(self, steps):
+        return sum(1 for d in self.dist if 0 <= d <= steps)
+
+
+def distance_field(magic, start, goal, limit=LIMIT):
+    # Grow the field until it contains the goal. Every path of at most reach
+    # steps lies inside the field, so a distance up to reach is exact.
+    reach = max(limit, abs(goal[0] - start[0]) + abs(goal[1] - start[1]))
+    while True:
+        field = DistanceField(magic, start, reach)
+        if field.distance(goal) is not None or field.complete:
+            return field
+        reach *= 2
+
+
+def parse_coord(arg):
+    x, y = map(int, arg.split(','))
+    return x, y
+
 
 def main(argv):
-    path = shortest_path(start, goal)
-    print(len(path))
-    visited = shortest_path(start, goal, 50)
-    print(len(visited))
+    if len(argv) < 2:
+        print("Usage: {} magic [goal_x,goal_y] [start_x,start_y]".format(argv[0]))
+        return 1
+    magic = int(argv[1])
+    goal = parse_coord(argv[2]) if len(argv) > 2 else (31, 39)
+    start = parse_coord(argv[3]) if len(argv) > 3 else (1, 1)
+    field = distance_field(magic, start, goal)
+    print(field.distance(goal))
+    print(field.within(LIMIT))
     return 0
 
+
 if __name__ == '__main__':
     sys.exit(main(sys.argv))
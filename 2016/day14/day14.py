@@ -1,73 +1,191 @@
 #!/usr/bin/env python3
-# Advent of Code 2016 - Day 14, Part One
+# Advent of Code 2016 - Day 14, Part One & Two
 # salt: ngcjuoqr
 # part one: 18626
 # part two: 20092
+#
+# The hashes are computed ahead in batches, by worker processes when they are
+# stretched. The triple and quintuplets of the last 1001 hashes are kept in a
+# ring buffer, along with a count of the quintuplets by character in the 1000
+# hashes after the current index. A triple is a key if the count of its
+# character is not zero, so the keys are found in order, in a single pass.
+#
+# The raw digests are cached on disk, so a rerun for the same salt only
+# reads them back, and computes the ones after the last cached index.
 
+import fcntl
+import mmap
+import os
+import re
 import sys
+from collections import deque
+from functools import partial
 from hashlib import md5
-from itertools import islice, chain
-from collections import defaultdict
-
-
-def window(seq, n=2):
-    "Returns a sliding window (of width n) over data from the iterable"
-    "   s -> (s0,s1,...s[n-1]), (s1,s2,...,sn), ...                   "
-    it = iter(seq)
-    result = tuple(islice(it, n))
-    if len(result) == n:
-        yield result
-    for elem in it:
-        result = result[1:] + (elem,)
-        yield result
-
-
-def gen_hash(salt, stretch=0):
-    index = 0
-    while True:
-        string = salt + str(index)
-        digest = md5(string.encode('utf-8')).hexdigest()
+from itertools import count, islice
+from multiprocessing import Pool
+
+WINDOW = 1000
+SIZE = WINDOW + 1
+BATCH = 1000
+DIGEST = 16
+
+# directory of the digest cache, set AOC_CACHE to '' to disable it
+CACHE = os.environ.get('AOC_CACHE',
+                       os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                    'cache'))
+
+TRIPLE = re.compile(r'(.)\1\1')
+QUINTUPLET = re.compile(r'(.)\1{4}')
+
+
+def stretched(salt, stretch, start, stop):
+    """Return the raw digests of the indices in [start, stop).
+
+    >>> [d.hex() for d in stretched('abc', 0, 18, 19)]
+    ['0034e0923cc38887a57bd7b1d4f953df']
+    >>> [d.hex() for d in stretched('abc', 2016, 0, 1)]
+    ['a107ff634856bb300138cac6568c0f24']
+    """
+    digests = []
+    for index in range(start, stop):
+        digest = md5('{}{}'.format(salt, index).encode('utf-8'))
         for _ in range(stretch):
-            digest = md5(digest.encode('utf-8')).hexdigest()
-        yield index, digest
-        index += 1
+            digest = md5(digest.hexdigest().encode('ascii'))
+        digests.append(digest.digest())
+    return digests
+
+
+def batches(salt, stretch, start=0, jobs=None, batch=BATCH):
+    # yields (first index, digests) for consecutive batches from start
+    jobs = jobs or os.cpu_count()
+    starts = count(start, batch)
+    if not stretch or jobs == 1:
+        for first in starts:
+            yield first, stretched(salt, stretch, first, first + batch)
+        return
+    task = partial(stretched, salt, stretch)
+    with Pool(jobs) as pool:
+        pending = deque()
+        for first in starts:
+            pending.append((first, pool.apply_async(task, (first, first + batch))))
+            if len(pending) >= 2 * jobs:
+                first, result = pending.popleft()
+                yield first, result.get()
+
+
+class Cache():
+    """Append-only file of raw digests, the digest of index n is stored at
+    offset 16 * n. Records are never changed once they are written, so any
+    number of processes can read the file while one of them appends to it
+    under an exclusive lock.
+
+    >>> import tempfile
+    >>> with tempfile.TemporaryDirectory() as tmp:
+    ...     cache = Cache(os.path.join(tmp, 'abc-0.md5'))
+    ...     cache.append(0, stretched('abc', 0, 0, 3))
+    ...     cache.append(2, stretched('abc', 0, 2, 5))
+    ...     len(cache), list(cache.read()) == stretched('abc', 0, 0, 5)
+    (5, True)
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def __len__(self):
+        try:
+            return os.path.getsize(self.path) // DIGEST
+        except FileNotFoundError:
+            return 0
+
+    def read(self):
+        """Yield the cached digests, in order of index."""
+        n = len(self)
+        if not n:
+            return
+        with open(self.path, 'rb') as f, \
+                mmap.mmap(f.fileno(), n * DIGEST, access=mmap.ACCESS_READ) as m:
+            for offset in range(0, n * DIGEST, DIGEST):
+                yield m[offset:offset + DIGEST]
+
+    def append(self, first, digests):
+        """Store the digests of the indices from first on, skipping the ones
+        that are already cached."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, 'ab') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            # drop a record that was only partly written
+            n = f.seek(0, os.SEEK_END) // DIGEST
+            f.truncate(n * DIGEST)
+            f.seek(0, os.SEEK_END)
+            if first <= n < first + len(digests):
+                f.write(b''.join(digests[n - first:]))
+            # closing the file releases the lock
+
+
+def gen_hash(salt, stretch=0, jobs=None, batch=BATCH, cache=CACHE):
+    """Yield (index, hex digest) for every index. Stretched hashes are computed
+    in jobs processes, and all digests are kept in a file per salt and
+    stretch in the cache directory, unless it is empty."""
+    start = 0
+    store = None
+    if cache:
+        name = '{}-{}.md5'.format(salt.encode('utf-8').hex(), stretch)
+        store = Cache(os.path.join(cache, name))
+        # counted while reading, the file may grow in the meantime
+        for start, digest in enumerate(store.read(), 1):
+            yield start - 1, digest.hex()
+    for first, digests in batches(salt, stretch, start, jobs, batch):
+        if store is not None:
+            store.append(first, digests)
+        for index, digest in enumerate(digests, first):
+            yield index, digest.hex()
+
+
+def features(digest):
+    # the character of the first triple, and of all quintuplets
+    triple = TRIPLE.search(digest)
+    return triple and triple.group(1), set(QUINTUPLET.findall(digest))
+
 
+def keys(hashes):
+    """Yield the indices of the keys, in order.
 
-def char_in_row(hash, n):
-    for w in window(hash, n):
-        if all(w[0] == c for c in w):
-            return w[0]
-    return None
+    >>> list(islice(keys(gen_hash('abc', cache='')), 64))[::63]
+    [39, 22728]
+    """
+    hashes = iter(hashes)
+    ring = [None] * SIZE
+    quintuplets = [0] * 16
+    for index, digest in islice(hashes, SIZE):
+        ring[index] = features(digest)
+        for c in ring[index][1]:
+            quintuplets[int(c, 16)] += 1
+    for index in count():
+        slot = index % SIZE
+        triple, quints = ring[slot]
+        # the window holds the WINDOW hashes after index
+        for c in quints:
+            quintuplets[int(c, 16)] -= 1
+        if triple is not None and quintuplets[int(triple, 16)]:
+            yield index
+        _, digest = next(hashes)
+        ring[slot] = features(digest)
+        for c in ring[slot][1]:
+            quintuplets[int(c, 16)] += 1
 
 
 def main(argv):
     if len(argv) < 2:
-        print("Usage: {} salt [stretch]".format(argv[0]))
+        print("Usage: {} salt [stretch] [jobs]".format(argv[0]))
         return 1
     salt = argv[1]
     if len(argv) > 2:
         stretch = int(argv[2])
     else:
         stretch = 0
+    jobs = int(argv[3]) if len(argv) > 3 else None
 
-    ghash = gen_hash(salt, stretch)
-    candidates = defaultdict(list)
-    valid = set()
-    while True:
-        index, digest = next(ghash)
-        c3 = char_in_row(digest, 3)
-        c5 = char_in_row(digest, 5)
-        if c5 in candidates:
-            valid |= set([(idx, hsh)
-                          for idx, hsh in candidates[c5]
-                          if (index - idx) > 0 and (index - idx) <= 1000])
-        if c3 is not None:
-            candidates[c3] += [(index, digest)]
-            
-        if len(valid) > 64:
-            if sorted(valid)[63][0] + 1000 < index:
-                break
-    print(sorted(list(valid))[63][0])
+    print(next(islice(keys(gen_hash(salt, stretch, jobs)), 63, None)))
     return 0
 
 
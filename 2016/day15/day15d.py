@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+# Advent of Code 2016 - Day 15, variant D
+
+import sys
+
+from discs import parse, first_time
+
+def main(argv):
+    if len(argv) < 2:
+        print("Usage: {} puzzle.txt".format(argv[0]))
+        return 1
+    with open(argv[1]) as f:
+        t = first_time(parse(f))
+    print('no solution' if t is None else t)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
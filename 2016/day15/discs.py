@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# Advent of Code 2016 - Day 15
+# Disc alignment by the Chinese remainder theorem.
+#
+# Disc d with n positions, at position p at time 0, is at position 0 when the
+# capsule reaches it if t + d + p = 0 (mod n). The congruences of all discs
+# are merged two at a time with the extended Euclidean algorithm, which also
+# works when the numbers of positions share a factor, and finds out when
+# there is no time at all.
+#
+# Run it to benchmark every variant, day15d.py being this one, on a growing
+# number of discs. Each runs in its own interpreter, and is reported with its
+# wall time and peak RSS:
+#
+#   discs.py [max_discs]
+
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+PRIMES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61]
+
+# largest product of positions the variants are run for; day15b.py keeps a
+# set of every candidate time per disc, so its memory grows with the product
+LIMITS = {'day15.py': 10**6, 'day15b.py': 10**7, 'day15c.py': 10**15,
+          'day15d.py': None}
+
+# ru_maxrss is in kilobytes on Linux, but in bytes on macOS
+RSS_UNIT = 1024 * 1024 if sys.platform == 'darwin' else 1024
+
+
+def parse(lines):
+    """Return the (time, modulus) congruence of every disc.
+
+    >>> parse(['Disc #1 has 5 positions; at time=0, it is at position 4.'])
+    [(0, 5)]
+    """
+    congruences = []
+    for line in lines:
+        numbers = list(map(int, re.findall(r'(\d+)', line)))
+        if numbers:
+            disc, positions, _, init = numbers
+            congruences.append(((-init - disc) % positions, positions))
+    return congruences
+
+
+def egcd(a, b):
+    """Return (g, x, y) with g = gcd(a, b) = a*x + b*y.
+
+    >>> egcd(240, 46)
+    (2, -9, 47)
+    """
+    x0, y0, x1, y1 = 1, 0, 0, 1
+    while b:
+        q, a, b = a // b, b, a % b
+        x0, x1 = x1, x0 - q * x1
+        y0, y1 = y1, y0 - q * y1
+    return a, x0, y0
+
+
+def crt(congruences):
+    """Return (t, n) such that t = a (mod m) for every (a, m) exactly when
+    t = t (mod n), or None if there is no such t.
+
+    >>> crt([(0, 5), (1, 2)])
+    (5, 10)
+    >>> crt([(1, 4), (3, 6)])
+    (9, 12)
+    >>> crt([(0, 4), (1, 6)]) is None
+    True
+    """
+    t, n = 0, 1
+    for a, m in congruences:
+        g, x, _ = egcd(n, m)
+        if (a - t) % g:
+            return None
+        # t + n*k = a (mod m)  <=>  k = x * (a - t) / g (mod m / g)
+        k = x * ((a - t) // g) % (m // g)
+        t += n * k
+        n *= m // g
+        t %= n
+    return t, n
+
+
+def first_time(congruences):
+    # first time to press the button, or None if the discs never align
+    solution = crt(congruences)
+    return solution and solution[0]
+
+
+def _run(script, path):
+    # run a variant on the puzzle at path in a fresh interpreter, returns its
+    # answer, wall time in seconds and peak RSS in MiB
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), script), path],
+        stdout=subprocess.PIPE)
+    out = proc.stdout.read()
+    proc.stdout.close()
+    _, status, usage = os.wait4(proc.pid, 0)
+    wall = time.perf_counter() - start
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    if proc.returncode:
+        raise ValueError('{} exited with {}'.format(script, proc.returncode))
+    return int(out), wall, usage.ru_maxrss / RSS_UNIT
+
+
+def benchmark(max_discs=12, seed=2016):
+    rng = random.Random(seed)
+    scripts = sorted(LIMITS)
+    print('{:>5} {:>20}'.format('discs', 'product') +
+          ''.join('{:>19}'.format(name) for name in scripts))
+    print('{:>26}'.format('') + '{:>10} {:>8}'.format('s', 'MiB') * len(scripts))
+    for count in range(2, max_discs + 1):
+        moduli = PRIMES[:count]
+        lines = ['Disc #{} has {} positions; at time=0, it is at position {}.'
+                 .format(disc, n, rng.randrange(n))
+                 for disc, n in enumerate(moduli, 1)]
+        product = 1
+        for n in moduli:
+            product *= n
+        answer = first_time(parse(lines))
+        results = {}
+        with tempfile.NamedTemporaryFile('w', suffix='.txt') as f:
+            f.write('\n'.join(lines) + '\n')
+            f.flush()
+            for script in scripts:
+                if LIMITS[script] is not None and product > LIMITS[script]:
+                    continue
+                t, wall, rss = _run(script, f.name)
+                if t != answer:
+                    raise ValueError('{} disagrees on {} discs'.format(script, count))
+                results[script] = wall, rss
+        print('{:>5} {:>20}'.format(count, product) +
+              ''.join('{:>10.3f} {:>8.1f}'.format(*results[name])
+                      if name in results else '{:>10} {:>8}'.format('-', '-')
+                      for name in scripts), flush=True)
+
+
+def main(argv):
+    max_discs = int(argv[1]) if len(argv) > 1 else 12
+    benchmark(max_discs)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
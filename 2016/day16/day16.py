@@ -1,24 +1,78 @@
 #!/usr/bin/env python3
-# Advent of Code 2016 - Day 15
+# Advent of Code 2016 - Day 16
+#
+# The checksum is never computed on the curve itself. Pairing bits with xnor
+# until the length is odd reduces every chunk of 2^m characters (the largest
+# power of two that divides the length) to one minus the parity of its ones.
+# The parity of any prefix of the curve follows from the seed and the
+# joiners: the curve is seed, joiner, inverse, joiner, seed, ... and the
+# joiners form the dragon curve of '0' themselves, so only the seed has to be
+# kept in memory.
 
 import sys
 
+INVERT = str.maketrans('01', '10')
 
-def gen_dragon(a):
-    invert = str.maketrans('01', '10')
-    while True:
-        b = a[::-1]
-        b = b.translate(invert)
-        result = a + '0' + b
-        yield result
-        a = result
 
+def joiner_ones(n):
+    """Return the number of ones in the first n joiners of the curve.
 
-def checksum(dragon):
-    chk = [a == b and '1' or '0' for a, b in zip(dragon[::2], dragon[1::2])]
-    while len(chk) % 2 == 0:
-        chk = [a == b and '1' or '0' for a, b in zip(chk[::2], chk[1::2])]
-    return chk
+    The joiners at odd positions alternate 0, 1; the joiner at position 2i
+    is the joiner at position i.
+
+    >>> [joiner_ones(n) for n in range(8)]
+    [0, 0, 0, 1, 1, 1, 2, 3]
+    """
+    count = 0
+    while n:
+        count += (n + 1) // 4
+        n //= 2
+    return count
+
+
+def prefix_parity(seed):
+    # returns a function giving the parity of the ones in the first p
+    # characters of the curve grown from seed
+    inverse = seed[::-1].translate(INVERT)
+    seed_parity = [0]
+    inverse_parity = [0]
+    for a, b in zip(seed, inverse):
+        seed_parity.append(seed_parity[-1] ^ (a == '1'))
+        inverse_parity.append(inverse_parity[-1] ^ (b == '1'))
+    period = len(seed) + 1
+
+    def parity(p):
+        # q full copies of the seed or its inverse, each with its joiner, and
+        # the first r characters of the next one
+        q, r = divmod(p, period)
+        rest = inverse_parity[r] if q & 1 else seed_parity[r]
+        return ((q + 1) // 2 * seed_parity[-1] + q // 2 * inverse_parity[-1] +
+                joiner_ones(q) + rest) & 1
+    return parity
+
+
+def checksum(seed, length):
+    """Return the checksum of the first length characters of the curve grown
+    from seed.
+
+    >>> checksum('110010110100', 12)
+    '100'
+    >>> checksum('10000', 20)
+    '01100'
+    """
+    # at least one pass is made, an odd last character is left out
+    pairs = length // 2
+    if not pairs:
+        return ''
+    chunk = 2 * (pairs & -pairs)
+    parity = prefix_parity(seed)
+    bits = []
+    last = 0
+    for end in range(chunk, 2 * pairs + 1, chunk):
+        p = parity(end)
+        bits.append('1' if p == last else '0')
+        last = p
+    return ''.join(bits)
 
 
 def main(argv):
@@ -29,12 +83,7 @@ def main(argv):
     with open(argv[1]) as f:
         for line in f:
             seed, length = line.strip().split()
-            length = int(length)
-            dragon = seed
-            gdragon = gen_dragon(seed)
-            while len(dragon) < length:
-                dragon = next(gdragon)
-            print("".join(checksum(dragon[:length])))
+            print(checksum(seed, int(length)))
     return 0
 
 
@@ -1,68 +1,125 @@
 #!/usr/bin/env python3
 # Advent of Code 2016 - Day 17
+#
+# A vertex is the room, the path to it and the MD5 state after hashing the
+# passcode and that path, so every door only hashes its own direction on a
+# copy of that state. The shortest path is found breadth-first. The longest
+# path only needs its length, so subtrees are searched depth-first, in
+# parallel, keeping nothing but the current branches in memory.
 
+import os
 import sys
+from functools import partial
 from hashlib import md5
-from itertools import compress, tee
+from multiprocessing import Pool
+
+import graph
 
 start = (1, 1)
 goal  = (4, 4)
-passcode = 'veumntbg'
-# test
-# passcode = 'ihgpwlah' # DDRRRD
-# passcode = 'kglvqrro' # DDUDRLRRUDRD
-# passcode = 'ulqzkmiv' # DRURDRUDDLLDLUURRDULRLDUUDDDRR
-
-dirs = {( 0, -1): 'U',
-        ( 0,  1): 'D',
-        (-1,  0): 'L',
-        ( 1,  0): 'R' }
-             
-def directions(path):
-    return ''.join([dirs[(n[0] - c[0], n[1] - c[1])] for c, n in pairwise(path)])
-
-def pairwise(iterable):
-    "s -> (s0,s1), (s1,s2), (s2, s3), ..."
-    a, b = tee(iterable)
-    next(b, None)
-    return zip(a, b)
-
-def gen_moves(coord, path):
-    x, y = coord
-
-    moves = [(x+dx, y+dy) for dx, dy in [(0, -1), (0, 1), (-1, 0), (1, 0)]]
-    valid = [0 < x < 5 and 0 < y < 5 for x, y in moves]
-    
-    digest = md5((passcode + directions(path)).encode('utf-8')).hexdigest()
-    doors = [direction in 'bcdef' and valid[i] for i, direction in enumerate(digest[:4])]
-    
-    return compress(moves, doors)
-        
-
-def bfs_paths(start, goal):
-    queue = [(start, [start])]
-    while queue:
-        (vertex, path) = queue.pop(0)
-        for current in set(gen_moves(vertex, path)):
-            if current == goal:
-                yield path + [current]
-            else:
-                queue.append((current, path + [current]))
-                
-def shortest_path(start, goal):
-    try:
-        return next(bfs_paths(start, goal))
-    except StopIteration:
-        return None 
+
+doors = [(( 0, -1), b'U'),
+         (( 0,  1), b'D'),
+         ((-1,  0), b'L'),
+         (( 1,  0), b'R')]
+
+
+def root(passcode, coord=start, path=''):
+    return coord, path, md5((passcode + path).encode('utf-8'))
+
+
+def gen_moves(vertex):
+    (x, y), path, state = vertex
+    if (x, y) == goal:
+        # the vault doors close behind us
+        return []
+
+    digest = state.digest()
+    nibbles = (digest[0] >> 4, digest[0] & 15, digest[1] >> 4, digest[1] & 15)
+    moves = []
+    for ((dx, dy), door), nibble in zip(doors, nibbles):
+        # b-f means open
+        if nibble > 10 and 0 < x + dx < 5 and 0 < y + dy < 5:
+            child = state.copy()
+            child.update(door)
+            moves.append(((x + dx, y + dy), path + door.decode(), child))
+    return moves
+
+
+def shortest_path(passcode):
+    """
+    >>> shortest_path('ihgpwlah')
+    'DDRRRD'
+    >>> shortest_path('hijkl') is None
+    True
+    """
+    # every path is a state of its own, so there is no visited set
+    for node in graph.bfs(root(passcode), gen_moves, key=None):
+        coord, path, _ = node.vertex
+        if coord == goal:
+            return path
+    return None
+
+
+def longest_from(passcode, vertex):
+    # depth-first, only the unexplored siblings along the path are stored
+    coord, path = vertex
+    longest = None
+    stack = [root(passcode, coord, path)]
+    while stack:
+        vertex = stack.pop()
+        if vertex[0] == goal:
+            longest = max(longest or 0, len(vertex[1]))
+        else:
+            stack.extend(gen_moves(vertex))
+    return longest
+
+
+def longest_path(passcode, jobs=None):
+    """Return the length of the longest path to the vault, searching the
+    subtrees in jobs processes.
+
+    >>> longest_path('kglvqrro', 1)
+    492
+    >>> longest_path('ulqzkmiv', 2)
+    830
+    """
+    jobs = jobs or os.cpu_count()
+    # split the search in a few subtrees per job
+    frontier = [root(passcode)]
+    longest = None
+    while frontier and len(frontier) < 4 * jobs:
+        vertices = frontier
+        frontier = []
+        for vertex in vertices:
+            if vertex[0] == goal:
+                longest = max(longest or 0, len(vertex[1]))
+            frontier.extend(gen_moves(vertex))
+    subtrees = [(coord, path) for coord, path, _ in frontier]
+    search = partial(longest_from, passcode)
+    if jobs == 1:
+        lengths = map(search, subtrees)
+    else:
+        with Pool(jobs) as pool:
+            lengths = pool.map(search, subtrees)
+    for length in lengths:
+        if length is not None:
+            longest = max(longest or 0, length)
+    return longest
+
 
 def main(argv):
-    paths = bfs_paths(start, goal)
-    paths = sorted(paths, key=lambda i: len(i))
-    print(len(paths[0]) - 1)
-    print(directions(paths[0]))
-    print(len(paths[-1]) - 1)
-    print(directions(paths[-1]))
+    if len(argv) < 2:
+        print("Usage: {} passcode [jobs]".format(argv[0]))
+        return 1
+    passcode = argv[1]
+    jobs = int(argv[2]) if len(argv) > 2 else None
+    shortest = shortest_path(passcode)
+    print(shortest and len(shortest))
+    print(shortest)
+    print(longest_path(passcode, jobs))
     return 0
 
+
 if __name__ == '__main__':
     sys.exit(main(sys.argv))
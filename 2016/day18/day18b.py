@@ -1,9 +1,48 @@
 #!/usr/bin/env python3
 # Advent of Code 2016 - Day 18
+#
+# A row is an integer with a bit set for every trap, the next row is the xor
+# of the row shifted left and right. The rows are checked for a cycle with
+# Brent's algorithm, which only keeps one saved row (at every power of two)
+# to compare against; once a row repeats, the safe tiles of all remaining
+# full cycles are added at once.
 
 import sys
-from operator import or_
-from functools import reduce
+
+TILES = str.maketrans('^.', '10')
+
+
+def parse(seed):
+    # returns the row and its width
+    return int(seed.translate(TILES), 2), len(seed)
+
+
+def safe_tiles(row, width, nrows):
+    """Return the number of safe tiles in the first nrows rows.
+
+    >>> safe_tiles(*parse('.^^.^.^^^^'), 10)
+    38
+    >>> safe_tiles(*parse('..^^.'), 10**12)
+    1500000000001
+    """
+    mask = (1 << width) - 1
+    total = index = 0
+    saved, saved_index, saved_total = row, index, total
+    while index < nrows:
+        total += width - row.bit_count()
+        row = (row << 1 ^ row >> 1) & mask
+        index += 1
+        if row == saved:
+            # the rows from saved_index on repeat with this period
+            period = index - saved_index
+            cycles, rest = divmod(nrows - index, period)
+            total += cycles * (total - saved_total)
+            index = nrows - rest
+            saved = -1
+        elif saved >= 0 and index & (index - 1) == 0:
+            saved, saved_index, saved_total = row, index, total
+    return total
+
 
 def main(argv):
     if len(argv) < 3:
@@ -12,17 +51,9 @@ def main(argv):
     nrows = int(argv[2])
     with open(argv[1]) as f:
         for line in f:
-            seed = line.strip()
-            length = len(seed)
-            mask = 2**length - 1
-            row = reduce(or_, ((c == '^') << (length - i - 1) for i, c in enumerate(seed)))
-            safe_tiles = bin(row ^ mask).count('1')
-            for _ in range(nrows - 1):
-                row = (row << 1 ^ row >> 1) & mask
-                safe_tiles += bin(row ^ mask).count('1')
-            print(safe_tiles)
+            print(safe_tiles(*parse(line.strip()), nrows))
     return 0
 
 
 if __name__ == '__main__':
-    sys.exit(main(sys.argv))
\ No newline at end of file
+    sys.exit(main(sys.argv))
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# Advent of Code 2016 - Day 19
+# Elves in a circle, eliminated one by one until a single elf is left.
+#
+# Rules:
+#   left    every elf steals from the elf to its left (day 19, part one)
+#   across  every elf steals from the elf across the circle (part two)
+#   k       every k-th elf is eliminated, counting on from the last one
+#
+# The simulations keep the circle in an array: a linked list of the next elf
+# for left and across, where the elf before the victim only moves forward,
+# and for every k-th either the same linked list, when k is small, or a
+# Fenwick tree of the elves that are left, to find the next victim in
+# O(log n). The closed forms are checked against them by verify.
+
+import os
+import sys
+from array import array
+from functools import partial
+from multiprocessing import Pool
+
+
+def left(elves):
+    """Winner of the left rule: rotate the highest bit of elves to the end.
+
+    >>> left(5)
+    3
+    """
+    return int(bin(elves)[3:] + '1', 2)
+
+
+def across(elves):
+    """Winner of the across rule.
+
+    >>> across(5)
+    2
+    >>> across(243)
+    243
+    """
+    t = 1
+    while 3 * t <= elves:
+        t *= 3
+    if elves == t:
+        return elves
+    return max(elves - t, 2*elves - 3*t)
+
+
+def every(elves, k):
+    """Winner of the every k-th rule (Josephus), in O(elves).
+
+    >>> every(7, 3)
+    4
+    """
+    j = 0
+    for i in range(2, elves + 1):
+        j = (j + k) % i
+    return j + 1
+
+
+def simulate_left(elves):
+    """
+    >>> [simulate_left(n) for n in range(1, 9)] == [left(n) for n in range(1, 9)]
+    True
+    """
+    after = array('l', range(1, elves + 1))
+    after[-1] = 0
+    elf = 0
+    while after[elf] != elf:
+        after[elf] = after[after[elf]]
+        elf = after[elf]
+    return elf + 1
+
+
+def simulate_across(elves):
+    """
+    >>> simulate_across(5)
+    2
+    """
+    after = array('l', range(1, elves + 1))
+    after[-1] = 0
+    # the elf before the victim, across from elf 0
+    before = max(elves // 2 - 1, 0)
+    for size in range(elves, 1, -1):
+        after[before] = after[after[before]]
+        # with an odd number of elves the victim moves one further along
+        if size & 1:
+            before = after[before]
+    return before + 1
+
+
+def simulate_every(elves, k):
+    """
+    >>> simulate_every(7, 3)
+    4
+    >>> simulate_every(5, 2) == simulate_left(5)
+    True
+    >>> simulate_every(1000, 20)
+    895
+    """
+    if k <= elves.bit_length():
+        # walking k - 1 steps through a linked list is cheaper than the tree
+        after = array('l', range(1, elves + 1))
+        after[-1] = 0
+        # the elf before the one counting starts at
+        elf = elves - 1
+        for _ in range(elves - 1):
+            for _ in range(k - 1):
+                elf = after[elf]
+            after[elf] = after[after[elf]]
+        return elf + 1
+    # tree[i] counts the elves left in (i - (i & -i), i]
+    tree = array('l', (i & -i for i in range(elves + 1)))
+    top = 1 << (elves.bit_length() - 1)
+    rank = 0
+    for size in range(elves, 0, -1):
+        rank = (rank + k - 1) % size
+        # find the elf with rank + 1 elves up to and including it
+        pos, count, bit = 0, rank + 1, top
+        while bit:
+            if pos + bit <= elves and tree[pos + bit] < count:
+                pos += bit
+                count -= tree[pos]
+            bit >>= 1
+        i = pos + 1
+        while i <= elves:
+            tree[i] -= 1
+            i += i & -i
+    # the last elf removed is the winner
+    return pos + 1
+
+
+def rule(name):
+    # returns the closed form and the simulation of a rule
+    if name == 'left':
+        return left, simulate_left
+    elif name == 'across':
+        return across, simulate_across
+    k = int(name)
+    return partial(every, k=k), partial(simulate_every, k=k)
+
+
+def check(name, elves):
+    closed, simulate = rule(name)
+    return closed(elves) == simulate(elves)
+
+
+def verify(name, elves, jobs=None):
+    """Return the circle sizes up to elves for which the closed form and
+    the simulation disagree.
+
+    >>> verify('across', 100, 1)
+    []
+    """
+    sizes = range(1, elves + 1)
+    if jobs == 1:
+        results = map(partial(check, name), sizes)
+    else:
+        with Pool(jobs or os.cpu_count()) as pool:
+            results = pool.map(partial(check, name), sizes, chunksize=64)
+    return [n for n, ok in zip(sizes, results) if not ok]
+
+
+def main(argv):
+    if len(argv) < 4 or argv[1] not in ('simulate', 'verify'):
+        print("Usage: {} simulate|verify left|across|k elves [jobs]".format(argv[0]))
+        return 1
+    name, elves = argv[2], int(argv[3])
+    if argv[1] == 'simulate':
+        print(rule(name)[1](elves))
+        return 0
+    jobs = int(argv[4]) if len(argv) > 4 else None
+    wrong = verify(name, elves, jobs)
+    print(wrong or "all {} circles agree".format(elves))
+    return 1 if wrong else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
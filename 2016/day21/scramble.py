@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# Advent of Code 2016 - Day 21
+# Scramble programs compiled to permutations.
+#
+# Moving letters around by position and swapping letters commute, so every
+# run of instructions up to a rotation based on a letter compiles to a single
+# permutation of the positions and a translation table of the letters. Only
+# the rotations based on a letter depend on the password; they are inverted
+# by a table from the position the letter ends up at to the positions it can
+# have come from, which works for any password length.
+
+import re
+from operator import itemgetter
+
+INSTRUCTIONS = [
+    ('swap position', r'swap position (\d+) with position (\d+)'),
+    ('swap letter', r'swap letter (\w) with letter (\w)'),
+    ('rotate left', r'rotate left (\d+) steps?'),
+    ('rotate right', r'rotate right (\d+) steps?'),
+    ('rotate letter', r'rotate based on position of letter (\w)'),
+    ('reverse', r'reverse positions (\d+) through (\d+)'),
+    ('move', r'move position (\d+) to position (\d+)'),
+]
+
+
+def parse(lines):
+    """Return the list of (instruction, arguments) of a scramble program.
+
+    >>> parse(['rotate left 1 step', 'swap letter d with letter b'])
+    [('rotate left', (1,)), ('swap letter', ('d', 'b'))]
+    """
+    program = []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        for name, pattern in INSTRUCTIONS:
+            match = re.fullmatch(pattern, line)
+            if match:
+                args = tuple(int(a) if a.isdigit() else a
+                             for a in match.groups())
+                program.append((name, args))
+                break
+        else:
+            raise ValueError("unknown instruction: {}".format(line))
+    return program
+
+
+def shift(i):
+    # steps to the right of a rotation based on a letter at position i
+    return 1 + i + (i >= 4)
+
+
+def rotate(string, n):
+    # rotate right by n steps
+    n %= len(string)
+    return string[-n:] + string[:-n] if n else string
+
+
+class Scrambler():
+    """Scramble program compiled for passwords of a given length.
+
+    >>> program = parse(['swap position 4 with position 0',
+    ...                  'swap letter d with letter b',
+    ...                  'reverse positions 0 through 4',
+    ...                  'rotate left 1 step',
+    ...                  'move position 1 to position 4',
+    ...                  'move position 3 to position 0',
+    ...                  'rotate based on position of letter b',
+    ...                  'rotate based on position of letter d'])
+    >>> scrambler = Scrambler(program, 5)
+    >>> scrambler.scramble('abcde')
+    'decab'
+    >>> sorted(scrambler.unscramble('decab'))
+    ['abcde', 'deabc']
+    """
+
+    def __init__(self, program, length):
+        self.length = length
+        # stages of positions, letters and letter: take the letters at
+        # positions, translate them, then rotate based on letter (if any)
+        stages = []
+        positions = list(range(length))
+        letters = {}
+        for name, args in program:
+            if name == 'swap position':
+                x, y = args
+                positions[x], positions[y] = positions[y], positions[x]
+            elif name == 'swap letter':
+                x, y = args
+                for c in (x, y):
+                    letters.setdefault(c, c)
+                swap = {x: y, y: x}
+                letters = {k: swap.get(v, v) for k, v in letters.items()}
+            elif name == 'rotate left':
+                n = args[0] % length
+                positions = positions[n:] + positions[:n]
+            elif name == 'rotate right':
+                positions = rotate(positions, args[0])
+            elif name == 'reverse':
+                x, y = args
+                positions[x:y+1] = positions[x:y+1][::-1]
+            elif name == 'move':
+                x, y = args
+                positions.insert(y, positions.pop(x))
+            elif name == 'rotate letter':
+                stages.append((positions, letters, args[0]))
+                positions = list(range(length))
+                letters = {}
+        stages.append((positions, letters, None))
+
+        # A rotation is folded into the positions of the next stage, with a
+        # getter for every number of steps. Letters that are not swapped are
+        # left out, an empty table means there is nothing to translate.
+        self.stages = []
+        self.inverse = []
+        for positions, letters, letter in stages:
+            letters = {k: v for k, v in letters.items() if k != v}
+            getters = [itemgetter(*((p - r) % length for p in positions))
+                       for r in range(length)]
+            self.stages.append((getters, str.maketrans(letters), letter))
+            inverse = [0] * length
+            for i, p in enumerate(positions):
+                inverse[p] = i
+            self.inverse.append((itemgetter(*inverse),
+                                 str.maketrans({v: k for k, v in letters.items()}),
+                                 letter))
+        self.inverse.reverse()
+        # the positions a letter can have been at before a rotation based on
+        # it, by the position it is at after it
+        self.unrotate = [[] for _ in range(length)]
+        for i in range(length):
+            self.unrotate[(i + shift(i)) % length].append(i)
+
+    def scramble(self, password):
+        steps = 0
+        for getters, letters, letter in self.stages:
+            password = ''.join(getters[steps](password))
+            if letters:
+                password = password.translate(letters)
+            if letter is not None:
+                steps = shift(password.index(letter)) % self.length
+        return password
+
+    def unscramble(self, password):
+        """Return every password that scrambles to password; there is only
+        one if the rotations based on a letter are invertible for this
+        length."""
+        passwords = [password]
+        for positions, letters, letter in self.inverse:
+            if letter is not None:
+                passwords = [rotate(p, -shift(i)) for p in passwords
+                             for i in self.unrotate[p.index(letter)]]
+            passwords = [''.join(positions(p.translate(letters)))
+                         for p in passwords]
+        return passwords
+
+    def scramble_all(self, passwords):
+        return map(self.scramble, passwords)
+
+    def unscramble_all(self, passwords):
+        return map(self.unscramble, passwords)
@@ -1,11 +1,21 @@
 #!/usr/bin/env python3
 # Advent of Code 2016 - Day 22
-# Solved part two by hand from the pretty printed grid.
+#
+# Part one sorts the available space, so the viable pairs of a node are
+# counted with a bisect. Part two moves data only by moving it into the empty
+# node. A node with more data than the empty node can hold never moves and is
+# a wall; all other nodes are interchangeable. The grid is a bitmap with a
+# border of walls, like day 13. The goal data moves when the empty node is
+# next to it, so the search is over (goal, empty neighbour of goal) states,
+# with the cost of moving the empty node around the goal found by BFS.
 
-import sys
 import re
-from itertools import permutations
+import sys
+from bisect import bisect_left
 from collections import namedtuple
+from heapq import heappop, heappush
+
+import graph
 
 NodeDF = namedtuple('NodeDF', 'size used avail use')
 
@@ -16,36 +26,117 @@ nrex = re.compile(r'/dev/grid/node-x(?P<x>\d+)-y(?P<y>\d+)'
                   r'\s+(?P<use>\d+)%')
 
 
+def parse(lines):
+    nodes = {}
+    for line in lines:
+        m = nrex.search(line)
+        if m:
+            x, y, size, used, avail, use = map(int, m.groups())
+            nodes[(x, y)] = NodeDF(size, used, avail, use)
+    return nodes
+
+
+def viable_pairs(nodes):
+    """Return the number of pairs (A, B) where the data of A fits on B.
+
+    >>> viable_pairs({(0, 0): NodeDF(10, 8, 2, 80), (1, 0): NodeDF(10, 0, 10, 0),
+    ...               (2, 0): NodeDF(10, 2, 8, 20)})
+    4
+    """
+    avail = sorted(node.avail for node in nodes.values())
+    count = 0
+    for node in nodes.values():
+        if node.used:
+            count += len(avail) - bisect_left(avail, node.used)
+            # a node is not a pair with itself
+            if node.avail >= node.used:
+                count -= 1
+    return count
+
+
+class Grid():
+    """Bitmap of the nodes that data can move through."""
+
+    def __init__(self, nodes):
+        self.width = max(x for x, _ in nodes) + 1
+        self.height = max(y for _, y in nodes) + 1
+        self.stride = self.width + 1
+        empty = min(nodes, key=lambda coord: nodes[coord].used)
+        capacity = nodes[empty].size
+        self.open = bytearray(self.stride * (self.height + 2))
+        for coord, node in nodes.items():
+            self.open[self.index(coord)] = node.used <= capacity
+        self.empty = self.index(empty)
+        self.steps = (-1, 1, -self.stride, self.stride)
+
+    def index(self, coord):
+        x, y = coord
+        return (y + 1) * self.stride + x
+
+    def distances(self, start, blocked, targets):
+        # BFS distances of the empty node from start to targets, without
+        # passing the blocked node
+        found = {}
+        moves = lambda i: [n for n in self.neighbours(i) if n != blocked]
+        for node in graph.bfs(start, moves):
+            if node.vertex in targets:
+                found[node.vertex] = node.depth
+                if len(found) == len(targets):
+                    break
+        return found
+
+    def neighbours(self, i):
+        return [n for n in (i + d for d in self.steps) if self.open[n]]
+
+
+def fewest_steps(nodes, source=None, target=(0, 0)):
+    """Return the fewest steps to move the data of source (by default the
+    top right node) to target, or None if it cannot get there.
+
+    >>> nodes = {}
+    >>> for line in ['0-0 10 8', '0-1 11 6', '0-2 32 28', '1-0 9 7', '1-1 8 0',
+    ...              '1-2 11 7', '2-0 10 6', '2-1 9 8', '2-2 9 6']:
+    ...     coord, size, used = line.split()
+    ...     x, y = map(int, coord.split('-'))
+    ...     nodes[(x, y)] = NodeDF(int(size), int(used), 0, 0)
+    >>> fewest_steps(nodes)
+    7
+    """
+    grid = Grid(nodes)
+    if source is None:
+        source = (grid.width - 1, 0)
+    goal, target = grid.index(source), grid.index(target)
+    if goal == target:
+        return 0
+    # cost of bringing the empty node next to the goal data first
+    queue = [(cost, goal, empty) for empty, cost in
+             grid.distances(grid.empty, goal, grid.neighbours(goal)).items()]
+    queue.sort()
+    best = {}
+    while queue:
+        cost, goal, empty = heappop(queue)
+        if goal == target:
+            return cost
+        if best.get((goal, empty), cost + 1) <= cost:
+            continue
+        best[(goal, empty)] = cost
+        # move the goal data into the empty node
+        heappush(queue, (cost + 1, empty, goal))
+        # or move the empty node to another side of the goal data
+        around = [n for n in grid.neighbours(goal) if n != empty]
+        for n, steps in grid.distances(empty, goal, around).items():
+            heappush(queue, (cost + steps, goal, n))
+    return None
+
+
 def main(argv):
     if len(argv) < 2:
         print("Usage: {} puzzle.txt".format(argv[0]))
         return 1
-    nodes = {}
     with open(argv[1]) as f:
-        for line in f:
-            m = nrex.search(line)
-            if m:
-                x, y, size, used, avail, use = map(int, m.groups())
-                nodes[(x, y)] = NodeDF(size, used, avail, use)
-
-        for y in range(31):
-            sys.stdout.write('{0:02d}: '.format(y))
-            for x in range(31):
-                node = nodes[(x, y)]
-                if node.used == 0:
-                    sys.stdout.write('_')
-                elif node.used > 100:
-                    sys.stdout.write('#')
-                else:
-                    sys.stdout.write('.')
-            sys.stdout.write('\n')
-        sys.stdout.write('\n')
-
-        viable = []
-        for a, b in permutations(nodes.keys(), 2):
-            if nodes[a].used != 0 and nodes[b].avail >= nodes[a].used:
-                viable += [(a, b)]
-        print(len(viable))
+        nodes = parse(f)
+    print(viable_pairs(nodes))
+    print(fewest_steps(nodes))
     return 0
 
 
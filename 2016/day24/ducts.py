@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# Advent of Code 2016 - Day 24
+# Shortest route through the air duct locations.
+#
+# One BFS from every location fills a row of the distance matrix between the
+# locations, and the Held-Karp algorithm finds the shortest route through
+# all of them. Every character other than a wall or open passage is a
+# location, so there can be more than ten; the route starts at 0.
+
+import sys
+
+import graph
+
+
+def parse(lines):
+    """Return the set of open coordinates and a dict of the locations.
+
+    >>> hvac, locations = parse(['#####', '#0.1#', '#####'])
+    >>> sorted(hvac), locations
+    ([(1, 1), (2, 1), (3, 1)], {'0': (1, 1), '1': (3, 1)})
+    """
+    hvac = set()
+    locations = {}
+    for y, line in enumerate(lines):
+        for x, c in enumerate(line.strip()):
+            if c == '#':
+                continue
+            hvac.add((x, y))
+            if c != '.':
+                locations[c] = (x, y)
+    return hvac, locations
+
+
+def gen_moves(hvac, vertex):
+    x, y = vertex
+    moves = [(x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y)]
+    return [move for move in moves if move in hvac]
+
+
+def steps(hvac, locations, cycle=False):
+    """Return the fewest steps from 0 that visit every location, and return
+    to 0 if cycle is true.
+
+    >>> hvac, locations = parse(['###########', '#0.1.....2#', '#.#######.#',
+    ...                          '#4.......3#', '###########'])
+    >>> steps(hvac, locations), steps(hvac, locations, cycle=True)
+    (14, 20)
+    """
+    labels = sorted(locations, key=lambda c: (c != '0', c))
+    dist = graph.distance_matrix([locations[c] for c in labels],
+                                 lambda vertex: gen_moves(hvac, vertex))
+    return graph.held_karp(dist, 0, cycle)
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# Advent of Code 2016 - graph search
+# Breadth-first and A* search for the maze and state searches of day 11, 17,
+# 22 and 24, and the distance matrix and travelling salesman route of day 24.
+#
+# The frontier is a deque (or a heap), and every node only points to its
+# parent, so paths are rebuilt when they are needed instead of copied on
+# every step.
+
+from collections import deque, namedtuple
+from heapq import heappop, heappush
+from itertools import count
+
+Node = namedtuple('Node', 'vertex depth parent')
+
+
+def identity(vertex):
+    return vertex
+
+
+def bfs(start, neighbours, key=identity, limit=None):
+    """Breadth-first search, yields a Node for every vertex reached, in order
+    of depth.
+
+    :start: vertex to start from
+    :neighbours: function returning the neighbours of a vertex
+    :key: function returning the key of a vertex in the visited set, so that
+          equivalent vertices are visited once; None to keep no visited set
+          at all, when every path is a vertex of its own
+    :limit: do not search deeper than this depth
+
+    >>> line = lambda v: [n for n in (v - 1, v + 1) if 0 <= n < 5]
+    >>> [(node.vertex, node.depth) for node in bfs(2, line)]
+    [(2, 0), (1, 1), (3, 1), (0, 2), (4, 2)]
+    >>> [node.vertex for node in bfs(0, line, limit=2)]
+    [0, 1, 2]
+    """
+    visited = set()
+    if key is not None:
+        visited.add(key(start))
+    queue = deque([Node(start, 0, None)])
+    while queue:
+        node = queue.popleft()
+        yield node
+        if limit is not None and node.depth >= limit:
+            continue
+        for vertex in neighbours(node.vertex):
+            if key is not None:
+                k = key(vertex)
+                if k in visited:
+                    continue
+                visited.add(k)
+            queue.append(Node(vertex, node.depth + 1, node))
+
+
+def search(start, neighbours, goal, key=identity, limit=None):
+    """Return the Node of the first vertex for which goal(vertex) is true, or
+    None if there is none. See bfs for the other arguments.
+
+    >>> line = lambda v: [v - 1, v + 1]
+    >>> search(0, line, lambda v: v == 3).depth
+    3
+    >>> search(0, line, lambda v: v == 3, limit=2) is None
+    True
+    """
+    for node in bfs(start, neighbours, key, limit):
+        if goal(node.vertex):
+            return node
+    return None
+
+
+def astar(start, neighbours, goal, heuristic, key=identity):
+    """A* search over edges of length one, returns the Node of the first
+    vertex for which goal(vertex) is true, or None if there is none.
+
+    The path to it is a shortest one as long as the heuristic is consistent:
+    it never overestimates the distance to a goal, and differs by at most one
+    between neighbours.
+
+    :heuristic: function returning a lower bound on the distance from a
+                vertex to a goal
+    :key: function returning the key of a vertex in the visited set
+
+    >>> line = lambda v: [v - 1, v + 1]
+    >>> node = astar(0, line, lambda v: v == 3, lambda v: abs(3 - v))
+    >>> node.depth, path(node)
+    (3, [0, 1, 2, 3])
+    """
+    tiebreak = count()
+    best = {key(start): 0}
+    queue = [(heuristic(start), 0, next(tiebreak), Node(start, 0, None))]
+    while queue:
+        _, _, _, node = heappop(queue)
+        if goal(node.vertex):
+            return node
+        if best[key(node.vertex)] < node.depth:
+            # reached by a shorter path after this one was queued
+            continue
+        depth = node.depth + 1
+        for vertex in neighbours(node.vertex):
+            k = key(vertex)
+            if best.get(k, depth + 1) <= depth:
+                continue
+            best[k] = depth
+            # prefer deeper nodes when the estimates are equal
+            heappush(queue, (depth + heuristic(vertex), -depth,
+                             next(tiebreak), Node(vertex, depth, node)))
+    return None
+
+
+def path(node):
+    """Return the vertices from the start up to and including node.
+
+    >>> path(search(0, lambda v: [v - 1, v + 1], lambda v: v == -2))
+    [0, -1, -2]
+    """
+    vertices = []
+    while node is not None:
+        vertices.append(node.vertex)
+        node = node.parent
+    return vertices[::-1]
+
+
+def distance_matrix(vertices, neighbours):
+    """Return the matrix of the lengths of the shortest paths between every
+    two of vertices, infinite when there is no path.
+
+    Every row is filled by one breadth-first search, which stops once it has
+    reached all of the vertices.
+
+    :vertices: list of vertices
+    :neighbours: function returning the neighbours of a vertex
+
+    >>> line = lambda v: [n for n in (v - 1, v + 1) if 0 <= n < 5]
+    >>> distance_matrix([0, 4, 2], line)
+    [[0, 4, 2], [4, 0, 2], [2, 2, 0]]
+    """
+    index = {vertex: i for i, vertex in enumerate(vertices)}
+    n = len(vertices)
+    infinity = float('inf')
+    dist = [[infinity] * n for _ in range(n)]
+    for i, start in enumerate(vertices):
+        left = n
+        for node in bfs(start, neighbours):
+            j = index.get(node.vertex)
+            if j is not None:
+                dist[i][j] = node.depth
+                left -= 1
+                if not left:
+                    break
+    return dist
+
+
+def held_karp(dist, start=0, cycle=False):
+    """Return the length of the shortest route from start that visits every
+    vertex, and returns to start if cycle is true.
+
+    Dynamic programming over subsets: best[mask][v] is the shortest route
+    from start that visits exactly the vertices in mask and ends in v. That
+    takes O(2^n n^2) time instead of trying all n! orders.
+
+    :dist: matrix of distances between the vertices
+    :start: index of the start vertex
+
+    >>> dist = [[0, 2, 9, 10], [2, 0, 6, 4], [9, 6, 0, 8], [10, 4, 8, 0]]
+    >>> held_karp(dist)
+    14
+    >>> held_karp(dist, cycle=True)
+    23
+    """
+    n = len(dist)
+    infinity = float('inf')
+    best = [[infinity] * n for _ in range(1 << n)]
+    best[1 << start][start] = 0
+    for mask in range(1 << n):
+        if not mask >> start & 1:
+            continue
+        row = best[mask]
+        for v in range(n):
+            length = row[v]
+            if length == infinity:
+                continue
+            for w in range(n):
+                if mask >> w & 1:
+                    continue
+                candidate = length + dist[v][w]
+                if candidate < best[mask | 1 << w][w]:
+                    best[mask | 1 << w][w] = candidate
+    ends = best[(1 << n) - 1]
+    if cycle:
+        return min(ends[v] + dist[v][start] for v in range(n))
+    return min(ends)
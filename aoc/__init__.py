@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+"""
+    aoc
+    ~~~
+    Tooling shared by all Advent of Code years in this repository.
+
+    :copyright: (c) 2017 by Martin Bor.
+    :license: MIT, see LICENSE for more details.
+"""
+
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+    aoc.bench
+    ~~~~~~~~~
+    Regression benchmark for all solutions.
+
+    Every solution is loaded through the registry and solved a number of
+    times in this interpreter. The median and spread of the run times, and the
+    answer, are compared with a stored baseline:
+
+        $ python3 -m aoc.bench --save             # record a baseline
+        $ python3 -m aoc.bench                    # compare against it
+        $ python3 -m aoc.bench '2017/05/*' '2016/14/*' --repeat 3
+
+    The benchmark fails when the median of a solution is more than
+    `--threshold` percent slower than its baseline, or when its answer
+    changed.
+
+    Solutions run with ``AOC_CACHE`` empty, so caches like the day 14 digest
+    cache do not turn every run after the first into a cache read.
+
+    :copyright: (c) 2017 by Martin Bor.
+    :license: MIT, see LICENSE for more details.
+"""
+
+import argparse
+import fnmatch
+import json
+import os
+import statistics
+import sys
+import time
+from collections import namedtuple
+
+from aoc import ROOT
+from aoc import registry
+
+BASELINE = os.path.join(ROOT, 'aoc', 'baseline.json')
+
+# solutions that can not run unattended
+SKIP = {
+    (2016, 1, 1),  # turtle graphics, waits for a key press
+    (2016, 1, 2),  # turtle graphics, needs a display
+}
+
+Timing = namedtuple('Timing', 'median stdev min max answer')
+
+
+def name(year, day, part):
+    """Return the name of a solution in the baseline.
+
+    >>> name(2017, 5, 2)
+    '2017/05/2'
+    """
+    return f"{year}/{day:02d}/{part}"
+
+
+def measure(year, day, part, repeat=5):
+    """Solve a puzzle repeatedly and time it.
+
+    :year, day, part: the puzzle to solve, with its puzzle input
+    :repeat: number of runs
+    :returns: Timing, times in seconds
+    """
+    solve = registry.solver(year, day, part)
+    text = registry.puzzle(year, day, part)
+    times = []
+
+    # time the solutions themselves, not caches they keep between runs
+    cache = os.environ.get('AOC_CACHE')
+    os.environ['AOC_CACHE'] = ''
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            answer = solve(text)
+            times.append(time.perf_counter() - start)
+    finally:
+        if cache is None:
+            del os.environ['AOC_CACHE']
+        else:
+            os.environ['AOC_CACHE'] = cache
+
+    return Timing(statistics.median(times),
+                  statistics.stdev(times) if repeat > 1 else 0.0,
+                  min(times), max(times), str(answer))
+
+
+def compare(timing, base, threshold, floor):
+    """Compare a timing with its baseline.
+
+    :timing: Timing of the current run
+    :base: Timing from the baseline, or None
+    :threshold: allowed slowdown of the median, in percent
+    :floor: medians below this many seconds never count as slower
+    :returns: status string, 'ok' if there is no regression
+
+    >>> base = Timing(1.0, 0.1, 0.9, 1.1, '42')
+    >>> compare(Timing(1.2, 0.1, 1.1, 1.3, '42'), base, 25, 0.01)
+    'ok'
+    >>> compare(Timing(1.3, 0.1, 1.2, 1.4, '42'), base, 25, 0.01)
+    'slower'
+    >>> compare(Timing(0.5, 0.1, 0.4, 0.6, '43'), base, 25, 0.01)
+    'answer'
+    >>> compare(Timing(0.5, 0.1, 0.4, 0.6, '43'), None, 25, 0.01)
+    'new'
+    """
+    if base is None:
+        return 'new'
+    if timing.answer != base.answer:
+        return 'answer'
+    if timing.median > floor and \
+            timing.median > base.median * (1 + threshold / 100):
+        return 'slower'
+    return 'ok'
+
+
+def load(path):
+    """Read a baseline file, returns an empty baseline if there is none."""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return {k: Timing(**v) for k, v in json.load(f).items()}
+
+
+def save(path, baseline):
+    """Write a baseline file."""
+    with open(path, 'w') as f:
+        json.dump({k: v._asdict() for k, v in sorted(baseline.items())}, f,
+                  indent=2)
+        f.write('\n')
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog='python3 -m aoc.bench',
+                                     description=__doc__.split('\n')[3].strip())
+    parser.add_argument('patterns', nargs='*',
+                        help="only run solutions matching these patterns, "
+                             "e.g. '2017/05/*'")
+    parser.add_argument('-r', '--repeat', type=int, default=5,
+                        help="number of runs per solution")
+    parser.add_argument('-t', '--threshold', type=float, default=25,
+                        help="allowed slowdown of the median, in percent")
+    parser.add_argument('--floor', type=float, default=0.01,
+                        help="never report solutions faster than this many "
+                             "seconds as slower")
+    parser.add_argument('-b', '--baseline', default=BASELINE,
+                        help="baseline file")
+    parser.add_argument('-s', '--save', action='store_true',
+                        help="store the results as the new baseline")
+    args = parser.parse_args(argv[1:])
+
+    baseline = load(args.baseline)
+    keys = [k for k in registry.solutions() if k not in SKIP and
+            (not args.patterns or
+             any(fnmatch.fnmatch(name(*k), p) for p in args.patterns))]
+    failed = 0
+
+    print(f"{'solution':<10} {'median s':>9} {'stdev s':>9} {'base s':>9} "
+          f"{'change':>8}  status")
+    for key in keys:
+        timing = measure(*key, repeat=args.repeat)
+        base = baseline.get(name(*key))
+        status = compare(timing, base, args.threshold, args.floor)
+        if base:
+            change = f"{(timing.median / base.median - 1) * 100:+7.1f}%"
+            base_median = f"{base.median:9.3f}"
+        else:
+            change = base_median = '-'
+        print(f"{name(*key):<10} {timing.median:9.3f} {timing.stdev:9.3f} "
+              f"{base_median:>9} {change:>8}  {status}", flush=True)
+        if status in ('slower', 'answer'):
+            failed += 1
+        baseline[name(*key)] = timing
+
+    if args.save:
+        save(args.baseline, baseline)
+    elif failed:
+        print(f"{failed} regression{'s' if failed > 1 else ''}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,341 @@
+# -*- coding: utf-8 -*-
+"""
+    aoc.registry
+    ~~~~~~~~~~~~
+    Load any solution as a ``solve(input_text) -> answer`` callable.
+
+    The solution files are not importable by name (``05b.py``,
+    ``day03-pt1.py``), so they are loaded from their path. A benchmark or
+    batch job can then run many inputs in a single warm interpreter:
+
+        >>> solve = solver(2017, 1, 1)
+        >>> solve('1122')
+        3
+        >>> solver(2016, 3, 1)('5 10 25\\n10 10 10\\n')
+        1
+        >>> solver(2016, 20, 2)('5-8\\n0-2\\n4-7\\n')
+        4294967288
+
+    The 2017 solutions get their puzzle parsed the same way their ``main``
+    does it and return whatever ``solve`` returns. Most 2016 solutions have
+    functions of their own that are called the same way. The others only
+    have a ``main(argv)`` that prints; their answer is the part of the
+    printed output that belongs to the requested part. Because many of those
+    keep state in module globals, they are executed in a fresh module for
+    every call.
+
+    :copyright: (c) 2017 by Martin Bor.
+    :license: MIT, see LICENSE for more details.
+"""
+
+import contextlib
+import importlib.util
+import io
+import os
+import re
+import sys
+import tempfile
+from collections import namedtuple
+from itertools import islice
+
+from aoc import ROOT
+
+Solution = namedtuple('Solution', 'script argv puzzle answer call',
+                      defaults=(None, None))
+
+# answer patterns for the first, second and last line of the output
+FIRST = r'\A(.*)'
+SECOND = r'\A.*\n(.*)'
+LAST = r'(.*)\Z'
+
+
+def _lines(text):
+    return text.strip().split('\n')
+
+
+def _bots(module, text):
+    # returns the bot that compares 17 and 61, and the product of the chips
+    # in the first three outputs
+    bots, outputs = module.parse(_lines(text))
+    found = []
+    module.run(bots, lambda nr, low, high: (low, high) == (17, 61) and
+               found.append(nr))
+    return found[0], outputs[0].chip * outputs[1].chip * outputs[2].chip
+
+
+def _checksum(text, part):
+    # returns the seed and the length on the line of a part
+    seed, length = _lines(text)[part].split()
+    return seed, int(length)
+
+
+def _machine(**registers):
+    # returns register a after running the assembunny program of a puzzle
+    return lambda module, text: module.Machine(module.parse(_lines(text)),
+                                               **registers).execute()['a']
+
+
+# How to run the 2016 solutions, by (day, part).
+#
+# When there is a call, the script is loaded once as a module, and the answer
+# is call(module, input_text). Otherwise the script runs its main: in argv
+# '{file}' is replaced by the path of a file holding the input text, and
+# '{text}' by the stripped input text itself. answer is then a regular
+# expression whose first group, at its first match in the output, is the
+# answer; without it the whole output is. Only trailing whitespace is stripped
+# from the output, as leading blanks can be part of the answer, like the
+# screen of day 8. Whole numbers are returned as int, as the 2017 solutions
+# do.
+#
+# puzzle is the name of the puzzle input file in the day directory, or, for
+# solutions that do not read a file, the puzzle input itself.
+SOLUTIONS_2016 = {
+    (1, 1): Solution('day01/day01-pt1.py', ['{file}'], 'puzzle.txt',
+                     r'Stopped at .*, Distance: (\d+)'),
+    (1, 2): Solution('day01/day01-pt2.py', ['{file}'], 'puzzle.txt',
+                     r'twice, .* Distance: (\d+)'),
+    (2, 1): Solution('day02/day02-pt1.py', ['{file}'], 'puzzle.txt'),
+    (2, 2): Solution('day02/day02-pt2.py', ['{file}'], 'puzzle.txt'),
+    (3, 1): Solution('day03/day03-pt1.py', ['{file}'], 'puzzle.txt',
+                     r'(\d+) possible'),
+    (3, 2): Solution('day03/day03-pt2.py', ['{file}'], 'puzzle.txt',
+                     r'(\d+) possible'),
+    (4, 1): Solution('day04/day04-pt1.py', ['{file}'], 'puzzle.txt'),
+    (4, 2): Solution('day04/day04-pt2.py', ['{file}'], 'puzzle.txt',
+                     r'(?m)^northpole-object-storage (\d+)$'),
+    (5, 1): Solution('day05/day05-pt1.py', ['{text}'], 'abc', call=lambda m, t:
+                     ''.join(islice(m.gen_password(t.strip()), 8))),
+    (5, 2): Solution('day05/day05-pt2.py', ['{text}'], 'abc', LAST),
+    (6, 1): Solution('day06/day06-pt1.py', ['{file}'], 'puzzle.txt'),
+    (6, 2): Solution('day06/day06-pt2.py', ['{file}'], 'puzzle.txt'),
+    (7, 1): Solution('day07/ipv7.py', ['{file}'], 'puzzle.txt',
+                     call=lambda m, t: m.count(_lines(t))[0]),
+    (7, 2): Solution('day07/ipv7.py', ['{file}'], 'puzzle.txt',
+                     call=lambda m, t: m.count(_lines(t))[1]),
+    (8, 1): Solution('day08/day08.py', ['{file}'], 'puzzle.txt'),
+    (8, 2): Solution('day08/day08.py', ['{file}', '--show'], 'puzzle.txt',
+                     r'(?s)\A(.*)\n'),
+    (9, 1): Solution('day09/decompress.py', ['{file}'], 'puzzle.txt',
+                     call=lambda m, t: m.lengths(t.strip().encode())[0]),
+    (9, 2): Solution('day09/decompress.py', ['{file}'], 'puzzle.txt',
+                     call=lambda m, t: m.lengths(t.strip().encode())[1]),
+    (10, 1): Solution('day10/day10.py', ['{file}'], 'puzzle.txt',
+                      call=lambda m, t: _bots(m, t)[0]),
+    (10, 2): Solution('day10/day10.py', ['{file}'], 'puzzle.txt',
+                      call=lambda m, t: _bots(m, t)[1]),
+    (11, 1): Solution('day11/day11.py', ['{file}'], 'puzzle.txt',
+                      call=lambda m, t: m.steps(m.parse(_lines(t)))),
+    # an elerium and a dilithium pair on the first floor
+    (11, 2): Solution('day11/day11.py', ['{file}'], 'puzzle.txt',
+                      call=lambda m, t: m.steps(m.parse(_lines(t)) +
+                                                [(0, 0), (0, 0)])),
+    (12, 1): Solution('day12/day12.py', ['{file}', '0'], 'puzzle.txt',
+                      call=_machine(c=0)),
+    (12, 2): Solution('day12/day12.py', ['{file}', '1'], 'puzzle.txt',
+                      call=_machine(c=1)),
+    (13, 1): Solution('day13/day13.py', ['{text}'], '1352', call=lambda m, t:
+                      m.distance_field(int(t), (1, 1), (31, 39))
+                      .distance((31, 39))),
+    (13, 2): Solution('day13/day13.py', ['{text}'], '1352', call=lambda m, t:
+                      m.distance_field(int(t), (1, 1), (31, 39))
+                      .within(m.LIMIT)),
+    (14, 1): Solution('day14/day14.py', ['{text}'], 'ngcjuoqr'),
+    (14, 2): Solution('day14/day14.py', ['{text}', '2016'], 'ngcjuoqr'),
+    (15, 1): Solution('day15/discs.py', ['{file}'], 'puzzle.txt',
+                      call=lambda m, t: m.first_time(m.parse(_lines(t)))),
+    (15, 2): Solution('day15/discs.py', ['{file}'], 'puzzle2.txt',
+                      call=lambda m, t: m.first_time(m.parse(_lines(t)))),
+    # a seed and a length on a line per part
+    (16, 1): Solution('day16/day16.py', ['{file}'], 'puzzle.txt',
+                      call=lambda m, t: m.checksum(*_checksum(t, 0))),
+    (16, 2): Solution('day16/day16.py', ['{file}'], 'puzzle.txt',
+                      call=lambda m, t: m.checksum(*_checksum(t, 1))),
+    (17, 1): Solution('day17/day17.py', ['{text}'], 'veumntbg',
+                      call=lambda m, t: m.shortest_path(t.strip())),
+    (17, 2): Solution('day17/day17.py', ['{text}'], 'veumntbg',
+                      call=lambda m, t: m.longest_path(t.strip())),
+    (18, 1): Solution('day18/day18b.py', ['{file}', '40'], 'puzzle.txt',
+                      call=lambda m, t: m.safe_tiles(*m.parse(t.strip()), 40)),
+    (18, 2): Solution('day18/day18b.py', ['{file}', '400000'], 'puzzle.txt',
+                      call=lambda m, t: m.safe_tiles(*m.parse(t.strip()),
+                                                     400000)),
+    (19, 1): Solution('day19/circle.py', ['{text}'], '3005290',
+                      call=lambda m, t: m.left(int(t))),
+    (19, 2): Solution('day19/circle.py', ['{text}'], '3005290',
+                      call=lambda m, t: m.across(int(t))),
+    (20, 1): Solution('day20/day20.py', ['{file}'], 'puzzle.txt',
+                      call=lambda m, t: m.parse(_lines(t)).first_free()),
+    (20, 2): Solution('day20/day20.py', ['{file}'], 'puzzle.txt',
+                      call=lambda m, t: m.parse(_lines(t)).free(0, m.MAX_IP)),
+    (21, 1): Solution('day21/scramble.py', ['{file}'], 'puzzle.txt',
+                      call=lambda m, t: m.Scrambler(m.parse(_lines(t)), 8)
+                      .scramble('abcdefgh')),
+    # every password, if the scramble is not invertible
+    (21, 2): Solution('day21/scramble.py', ['{file}'], 'puzzle.txt',
+                      call=lambda m, t: '\n'.join(sorted(
+                          m.Scrambler(m.parse(_lines(t)), 8)
+                          .unscramble('fbgdceah')))),
+    (22, 1): Solution('day22/day22.py', ['{file}'], 'puzzle.txt',
+                      call=lambda m, t: m.viable_pairs(m.parse(_lines(t)))),
+    (22, 2): Solution('day22/day22.py', ['{file}'], 'puzzle.txt',
+                      call=lambda m, t: m.fewest_steps(m.parse(_lines(t)))),
+    (23, 1): Solution('day23/day23-pt1.py', ['{file}'], 'puzzle.txt',
+                      call=_machine(a=7)),
+    (23, 2): Solution('day23/day23-pt2.py', ['{file}'], 'puzzle.txt',
+                      call=_machine(a=12)),
+    (24, 1): Solution('day24/ducts.py', ['{file}'], 'puzzle.txt',
+                      call=lambda m, t: m.steps(*m.parse(_lines(t)))),
+    (24, 2): Solution('day24/ducts.py', ['{file}'], 'puzzle.txt',
+                      call=lambda m, t: m.steps(*m.parse(_lines(t)),
+                                                cycle=True)),
+    (25, 1): Solution('day25/day25.py', ['{file}'], 'puzzle.txt',
+                      call=lambda m, t: m.find_clock(m.parse(_lines(t)),
+                                                     os.cpu_count())),
+}
+
+
+def _ints(sep=None):
+    return lambda text: ((int(x) for x in text.strip().split(sep)),)
+
+
+def _generators(text):
+    return tuple(int(line.strip().split()[-1])
+                 for line in text.strip().split('\n')[:2])
+
+
+# How the 2017 solutions parse their puzzle input into arguments for solve,
+# by (day, part), or by (day, None) when both parts do the same. Anything not
+# listed is passed as the stripped input text.
+PARSERS_2017 = {
+    (3, None): lambda text: (int(text.strip()),),
+    (5, None): _ints('\n'),
+    (6, None): lambda text: ([int(x) for x in text.strip().split()],),
+    (10, 1): _ints(','),
+    (15, None): _generators,
+    (17, None): lambda text: (int(text.strip()),),
+    (19, None): lambda text: (text,),
+    (20, None): lambda text: (text,),
+}
+
+
+def _load(name, path):
+    """Execute the file at path as a new module called name."""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    # registered, so that worker processes can unpickle its functions
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+
+    return module
+
+
+def solutions():
+    """Return all (year, day, part) triples that have a solution, in order."""
+    keys = [(2016, day, part) for day, part in SOLUTIONS_2016]
+    for day in range(1, 26):
+        for part, suffix in ((1, 'a'), (2, 'b')):
+            if os.path.exists(os.path.join(ROOT, '2017', f"{day:02d}{suffix}.py")):
+                keys.append((2017, day, part))
+
+    return keys
+
+
+def puzzle(year, day, part):
+    """Return the puzzle input shipped in the repository.
+
+    >>> puzzle(2017, 17, 2)
+    '301\\n'
+    """
+    if year == 2016:
+        solution = SOLUTIONS_2016[(day, part)]
+        if '{file}' not in solution.argv:
+            return solution.puzzle
+        path = os.path.join(ROOT, '2016', os.path.dirname(solution.script),
+                            solution.puzzle)
+    else:
+        path = os.path.join(ROOT, str(year), f"{day:02d}.input")
+    with open(path) as f:
+        return f.read()
+
+
+def _solver_2017(day, part):
+    path = os.path.join(ROOT, '2017', f"{day:02d}{'ab'[part - 1]}.py")
+    if not os.path.exists(path):
+        raise KeyError((2017, day, part))
+    # for the helper modules, like vector and blindspin
+    if os.path.dirname(path) not in sys.path:
+        sys.path.append(os.path.dirname(path))
+    module = _load(f"aoc2017_{day:02d}{'ab'[part - 1]}", path)
+    parse = PARSERS_2017.get((day, part),
+                             PARSERS_2017.get((day, None),
+                                              lambda text: (text.strip(),)))
+
+    def solve(text):
+        return module.solve(*parse(text))
+    solve.__doc__ = module.solve.__doc__
+
+    return solve
+
+
+def _answer(output):
+    # whole numbers as int, anything else as it is
+    if re.fullmatch(r'-?[1-9][0-9]*|0', output):
+        return int(output)
+    return output
+
+
+def _solver_2016(day, part):
+    solution = SOLUTIONS_2016[(day, part)]
+    path = os.path.join(ROOT, '2016', solution.script)
+    name = 'aoc2016_' + os.path.basename(path)[:-3].replace('-', '_')
+    # for the helper modules in the day directory, as when run as a script,
+    # and for the modules shared between days, like graph and assembunny
+    for directory in (os.path.dirname(path), os.path.join(ROOT, '2016')):
+        if directory not in sys.path:
+            sys.path.append(directory)
+
+    if solution.call is not None:
+        module = _load(name, path)
+
+        def solve(text):
+            return solution.call(module, text)
+
+        return solve
+
+    def solve(text):
+        with tempfile.NamedTemporaryFile('w', suffix='.txt') as f:
+            f.write(text)
+            f.flush()
+            argv = [path] + [arg.format(file=f.name, text=text.strip())
+                             for arg in solution.argv]
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out), \
+                    contextlib.redirect_stderr(io.StringIO()):
+                status = _load(name, path).main(argv)
+        if status:
+            raise ValueError(f"{solution.script} exited with {status}")
+        output = out.getvalue().rstrip()
+        if solution.answer is None:
+            return _answer(output)
+        match = re.search(solution.answer, output)
+        if match is None:
+            raise ValueError(f"{solution.script} printed no answer")
+        return _answer(match.group(1))
+
+    return solve
+
+
+def solver(year, day, part):
+    """Return a solve(input_text) -> answer callable for a puzzle.
+
+    :year: 2016 or 2017
+    :day: day of the puzzle, 1-25
+    :part: part of the puzzle, 1 or 2
+    :returns: solve function
+    :raises KeyError: if there is no solution for the puzzle
+    """
+    if year == 2016:
+        return _solver_2016(day, part)
+    elif year == 2017:
+        return _solver_2017(day, part)
+    raise KeyError((year, day, part))
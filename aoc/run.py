@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+    aoc.run
+    ~~~~~~~
+    Run every solution in the repository and report its resource usage.
+
+    Solutions are discovered in ``2016/day*/day*.py`` and ``2017/NN[ab].py``.
+    They get the path of their puzzle input (``puzzle.txt`` or ``NN.input``)
+    on the command line, except for the few listed in `ARGS` and `STDIN`.
+
+    Every solution runs in its own interpreter, at most `--jobs` of them at
+    the same time, so a full run takes about as long as the slowest day.
+    ``AOC_CACHE`` is empty for them, so the day 14 digest cache is not used.
+    Afterwards a table with the part, wall time, CPU time, peak RSS and
+    answer of every run is printed. A run that solves both parts is part
+    ``1+2``, with both answers:
+
+        $ python3 -m aoc.run --jobs 8
+        $ python3 -m aoc.run '2016/day1*' --python pypy3
+
+    :copyright: (c) 2017 by Martin Bor.
+    :license: MIT, see LICENSE for more details.
+"""
+
+import argparse
+import fnmatch
+import glob
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from aoc import ROOT
+
+Job = namedtuple('Job', 'script args stdin part')
+Result = namedtuple('Result', 'job status wall cpu rss answer')
+
+# solutions that can not run unattended
+SKIP = {
+    '2016/day01/day01-pt1.py',  # turtle graphics, waits for a key press
+    '2016/day01/day01-pt2.py',  # turtle graphics, needs a display
+}
+
+# command lines for 2016 solutions that do not take a single puzzle.txt
+ARGS = {
+    '2016/day05/day05-pt1.py': [['abc']],
+    '2016/day05/day05-pt2.py': [['abc']],
+    '2016/day12/day12.py': [['puzzle.txt', '0'], ['puzzle.txt', '1']],
+    '2016/day13/day13.py': [['1352']],
+    '2016/day14/day14.py': [['ngcjuoqr'], ['ngcjuoqr', '2016']],
+    '2016/day15/day15.py': [['puzzle.txt'], ['puzzle2.txt']],
+    '2016/day15/day15b.py': [['puzzle.txt'], ['puzzle2.txt']],
+    '2016/day15/day15c.py': [['puzzle.txt'], ['puzzle2.txt']],
+    '2016/day15/day15d.py': [['puzzle.txt'], ['puzzle2.txt']],
+    '2016/day17/day17.py': [['veumntbg']],
+    '2016/day18/day18.py': [['puzzle.txt', '40'], ['puzzle.txt', '400000']],
+    '2016/day18/day18b.py': [['puzzle.txt', '40'], ['puzzle.txt', '400000']],
+    '2016/day19/day19-pt1.py': [['3005290']],
+    '2016/day19/day19-pt2.py': [['3005290']],
+}
+
+# 2016 solutions that solve both parts in one run, and print the answer of
+# part one before that of part two as the last two lines
+BOTH = {
+    '2016/day10/day10.py',
+    '2016/day11/day11.py',
+    '2016/day13/day13.py',
+    '2016/day16/day16.py',
+    '2016/day17/day17.py',
+    '2016/day20/day20.py',
+    '2016/day22/day22.py',
+}
+
+# 2017 solutions that take the puzzle itself as argument, not a file name
+STDIN = {
+    '2017/03a.py',
+    '2017/03b.py',
+}
+
+# ru_maxrss is in kilobytes on Linux, but in bytes on macOS
+RSS_UNIT = 1024 * 1024 if sys.platform == 'darwin' else 1024
+
+
+def discover(patterns=None):
+    """Find all solutions and the way they should be invoked.
+
+    :patterns: optional list of shell patterns the script path (relative to
+               the repository root) should match
+    :returns: list of Jobs, sorted by year, day and part
+    """
+    jobs = []
+
+    for path in sorted(glob.glob(os.path.join(ROOT, '2016', 'day*', 'day*.py'))):
+        script = os.path.relpath(path, ROOT)
+        if script in SKIP:
+            continue
+        runs = ARGS.get(script, [['puzzle.txt']])
+        for i, args in enumerate(runs, 1):
+            if script in BOTH:
+                part = '1+2'
+            elif '-pt' in script:
+                part = script[-4]
+            else:
+                # one run per part, or part one only
+                part = str(i)
+            jobs.append(Job(script, args, None, part))
+
+    for path in sorted(glob.glob(os.path.join(ROOT, '2017', '[0-9][0-9][ab].py'))):
+        script = os.path.relpath(path, ROOT)
+        puzzle = os.path.basename(path)[:2] + '.input'
+        part = '12'['ab'.index(script[-4])]
+        if script in STDIN:
+            jobs.append(Job(script, [], puzzle, part))
+        else:
+            jobs.append(Job(script, [puzzle], None, part))
+
+    if patterns:
+        jobs = [job for job in jobs
+                if any(fnmatch.fnmatch(job.script, p) for p in patterns)]
+
+    return jobs
+
+
+def run(job, python=sys.executable, timeout=None):
+    """Run a single solution in a fresh interpreter.
+
+    The child is reaped with os.wait4, which hands us the resource usage of
+    exactly this child, even when several solutions run concurrently.
+
+    :job: Job to run
+    :python: interpreter to run the solution with
+    :timeout: kill the solution after this many seconds
+    :returns: Result
+    """
+    cwd, name = os.path.split(os.path.join(ROOT, job.script))
+    stdin = open(os.path.join(cwd, job.stdin)) if job.stdin else subprocess.DEVNULL
+
+    # time the solutions themselves, not caches they keep between runs
+    env = dict(os.environ, AOC_CACHE='')
+    # the 2016 days import the modules shared between them from 2016/
+    env['PYTHONPATH'] = os.pathsep.join(
+        filter(None, [os.path.join(ROOT, '2016'), env.get('PYTHONPATH')]))
+
+    with tempfile.TemporaryFile() as out:
+        start = time.perf_counter()
+        proc = subprocess.Popen([python, name] + job.args, cwd=cwd,
+                                stdin=stdin, stdout=out,
+                                stderr=subprocess.DEVNULL, env=env)
+        timer = threading.Timer(timeout, proc.kill) if timeout else None
+        if timer:
+            timer.start()
+        _, status, usage = os.wait4(proc.pid, 0)
+        wall = time.perf_counter() - start
+        if timer:
+            timer.cancel()
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        if stdin is not subprocess.DEVNULL:
+            stdin.close()
+
+        out.seek(0)
+        lines = out.read().decode('utf-8', 'replace').split('\n')
+
+    if proc.returncode == 0:
+        status = 'ok'
+    elif timeout and wall >= timeout and proc.returncode < 0:
+        status = 'timeout'
+    else:
+        status = f"exit {proc.returncode}"
+    # the last line, or the last two for a run that solves both parts
+    answers = [line.strip() for line in lines if line.strip()]
+    answer = ' / '.join(answers[-2 if job.part == '1+2' else -1:])
+
+    return Result(job, status, wall, usage.ru_utime + usage.ru_stime,
+                  usage.ru_maxrss / RSS_UNIT, answer)
+
+
+def report(results, elapsed, out=sys.stdout):
+    """Print a table of results.
+
+    :results: list of Results
+    :elapsed: wall clock time of the whole run
+    :out: file to write the table to
+    """
+    header = ('solution', 'args', 'part', 'status', 'wall s', 'cpu s',
+              'rss MiB', 'answer')
+    out.write(f"{header[0]:<26} {header[1]:<22} {header[2]:<4} "
+              f"{header[3]:<8} {header[4]:>8} {header[5]:>8} {header[6]:>8}  "
+              f"{header[7]}\n")
+
+    for r in results:
+        args = ' '.join(r.job.args) or (f"< {r.job.stdin}" if r.job.stdin else '')
+        out.write(f"{r.job.script:<26} {args:<22} {r.job.part:<4} "
+                  f"{r.status:<8} {r.wall:8.2f} {r.cpu:8.2f} {r.rss:8.1f}  "
+                  f"{r.answer[:40]}\n")
+
+    out.write(f"{len(results)} runs, {sum(r.wall for r in results):.2f} s "
+              f"serial, {elapsed:.2f} s elapsed, "
+              f"max rss {max((r.rss for r in results), default=0):.1f} MiB\n")
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog='python3 -m aoc.run',
+                                     description=__doc__.split('\n')[3].strip())
+    parser.add_argument('patterns', nargs='*',
+                        help="only run solutions matching these patterns, "
+                             "e.g. '2016/day1*'")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(),
+                        help="number of solutions to run concurrently")
+    parser.add_argument('-t', '--timeout', type=float, default=None,
+                        help="kill a solution after this many seconds")
+    parser.add_argument('--python', default=sys.executable,
+                        help="interpreter to run the solutions with")
+    args = parser.parse_args(argv[1:])
+
+    jobs = discover(args.patterns)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        results = list(pool.map(lambda job: run(job, args.python, args.timeout),
+                                jobs))
+    report(results, time.perf_counter() - start)
+
+    return 0 if all(r.status == 'ok' for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))